@@ -9,18 +9,85 @@ def run_query(user_query):
     print("\n[System] Final response:")
     print(result)
 
+def run_batch(user_queries):
+    # One orchestrator and one pass over the logs for the whole batch
+    orchestrator = OrchestratorAgent()
+    results = orchestrator.handle_batch(user_queries)
+    for user_query, result in zip(user_queries, results):
+        print("\n[System] Received query:", user_query)
+        print("\n[System] Final response:")
+        print(result)
+    return results
+
 if __name__ == "__main__":
     sample_query = "Why is task TID-12345 failing?"
     run_query(sample_query)
 
 
 # multi_agent_ops_ai/agents/orchestrator_agent.py
+import copy
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import IntFlag
 from agents.log_agent import LogAgent
 from agents.code_agent import CodeAgent
 from agents.database_agent import DatabaseAgent
 from agents.incident_agent import IncidentAgent
 from agents.jira_agent import JiraAgent
 
+_TID_RE = re.compile(r"TID[-_]?\d+")
+
+class Plan(IntFlag):
+    NONE = 0
+    LOG = 1
+    CODE = 2
+    DATABASE = 4
+    INCIDENT = 8
+    JIRA = 16
+
+# One pass over the query; each named group selects the agents it implies
+_PLAN_RE = re.compile(
+    r"(?P<error>fail|error)"
+    r"|(?P<perf>latency|time)"
+    r"|(?P<incident>incident)"
+    r"|(?P<jira>jira|ticket|escalate)"
+)
+_GROUP_PLANS = {
+    "error": Plan.LOG | Plan.CODE,
+    "perf": Plan.DATABASE,
+    "incident": Plan.INCIDENT,
+    "jira": Plan.JIRA,
+}
+
+@functools.lru_cache(maxsize=1024)
+def _classify(query_lower):
+    plan = Plan.NONE
+    for match in _PLAN_RE.finditer(query_lower):
+        plan |= _GROUP_PLANS[match.lastgroup]
+    return plan
+
+# Summary sections in output order: the plan flag that produces each one,
+# its label and the Context field holding the result
+_SUMMARY_TABLE = (
+    (Plan.LOG, "Log Summary", "log_summary"),
+    (Plan.CODE, "Code Analysis", "code_analysis"),
+    (Plan.DATABASE, "DB Metrics", "db_metrics"),
+    (Plan.INCIDENT, "Incident History", "incident_history"),
+    (Plan.JIRA, "JIRA Ticket Created", "jira_ticket"),
+)
+
+@dataclass(slots=True)
+class Context:
+    query: str
+    task_id: str
+    log_summary: str | None = None
+    code_analysis: str | None = None
+    db_metrics: str | None = None
+    incident_history: str | None = None
+    jira_ticket: str | None = None
+
 class OrchestratorAgent:
     def __init__(self):
         self.log_agent = LogAgent()
@@ -30,92 +97,181 @@ class OrchestratorAgent:
         self.jira_agent = JiraAgent()
 
     def handle_query(self, query: str) -> str:
-        context = {"query": query, "task_id": self.extract_task_id(query)}
+        context = Context(query=query, task_id=self.extract_task_id(query))
         agent_plan = self.classify_agents_needed(query)
 
-        print("[Orchestrator] Plan:", agent_plan)
+        print("[Orchestrator] Plan:", agent_plan.name)
+
+        # Metrics never depend on the other agents, and incidents only need the
+        # log summary, so both run alongside the log -> code chain. Background
+        # agents get a snapshot of the context rather than the live object.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            db_future = None
+            if agent_plan & Plan.DATABASE:
+                db_future = executor.submit(self.db_agent.query_metrics, copy.copy(context))
+
+            if agent_plan & Plan.LOG:
+                context.log_summary = self.log_agent.analyze_logs(context)
 
-        if "log" in agent_plan:
-            context["log_summary"] = self.log_agent.analyze_logs(context)
+            incident_future = None
+            if agent_plan & Plan.INCIDENT:
+                incident_future = executor.submit(self.incident_agent.search_history, copy.copy(context))
 
-        if "code" in agent_plan and "log_summary" in context:
-            context["code_analysis"] = self.code_agent.analyze_code(context)
+            if agent_plan & Plan.CODE and context.log_summary is not None:
+                context.code_analysis = self.code_agent.analyze_code(context)
 
-        if "database" in agent_plan:
-            context["db_metrics"] = self.db_agent.query_metrics(context)
+            if db_future is not None:
+                context.db_metrics = db_future.result()
 
-        if "incident" in agent_plan:
-            context["incident_history"] = self.incident_agent.search_history(context)
+            if incident_future is not None:
+                context.incident_history = incident_future.result()
 
-        if "jira" in agent_plan:
-            context["jira_ticket"] = self.jira_agent.create_ticket(context)
+        if agent_plan & Plan.JIRA:
+            context.jira_ticket = self.jira_agent.create_ticket(context)
 
-        return self.summarize_response(context)
+        return self.summarize_response(agent_plan, context)
+
+    def handle_batch(self, queries):
+        log_task_ids = [
+            self.extract_task_id(query)
+            for query in queries
+            if self.classify_agents_needed(query) & Plan.LOG
+        ]
+        self.log_agent.prefetch(log_task_ids)
+        return [self.handle_query(query) for query in queries]
 
     def extract_task_id(self, query):
-        import re
-        match = re.search(r"TID[-_]?\d+", query)
+        match = _TID_RE.search(query)
         return match.group(0) if match else "UNKNOWN"
 
     def classify_agents_needed(self, query):
-        query = query.lower()
-        plan = []
-        if "fail" in query or "error" in query:
-            plan.extend(["log", "code"])
-        if "latency" in query or "time" in query:
-            plan.append("database")
-        if "incident" in query:
-            plan.append("incident")
-        if "jira" in query or "ticket" in query or "escalate" in query:
-            plan.append("jira")
-        return plan
-
-    def summarize_response(self, context):
+        return _classify(query.lower())
+
+    def summarize_response(self, agent_plan, context):
+        # Only sections in the plan can hold a result; code analysis may still
+        # be missing when the log step produced nothing
         parts = []
-        if "log_summary" in context:
-            parts.append(f"Log Summary: {context['log_summary']}")
-        if "code_analysis" in context:
-            parts.append(f"Code Analysis: {context['code_analysis']}")
-        if "db_metrics" in context:
-            parts.append(f"DB Metrics: {context['db_metrics']}")
-        if "incident_history" in context:
-            parts.append(f"Incident History: {context['incident_history']}")
-        if "jira_ticket" in context:
-            parts.append(f"JIRA Ticket Created: {context['jira_ticket']}")
+        for flag, label, field in _SUMMARY_TABLE:
+            if agent_plan & flag:
+                value = getattr(context, field)
+                if value is not None:
+                    parts.append(f"{label}: {value}")
         return "\n".join(parts)
 
 
 # multi_agent_ops_ai/agents/log_agent.py
+import functools
+import mmap
 import os
+import re
+from tools.file_reader import map_files
+from tools.log_index import files_for
 from tools.log_tools import classify_log_error
 
+LOG_DIR = "data/logs"
+
+# Matching lines kept per task; the earliest ones win and scanning stops there
+MAX_MATCHING_LINES = 250
+
+# Lines gathered by LogAgent.prefetch, consumed by the next analysis of each task
+_prefetched_lines = {}
+
+def _scan_log_file(path, pattern, needles):
+    # Search the mapped bytes for any task id and decode only the lines that
+    # hit; each hit line is then attributed to every task id it contains
+    found = {needle: [] for needle in needles}
+    open_needles = len(needles)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return found
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            match = pattern.search(mm)
+            while match and open_needles:
+                line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                line_end = mm.find(b"\n", match.start())
+                if line_end == -1:
+                    line_end = len(mm)
+                # The slice already excludes the newline; only a CRLF needs trimming
+                text_end = line_end - 1 if line_end > line_start and mm[line_end - 1] == 13 else line_end
+                raw = mm[line_start:text_end]
+                line = None
+                for needle in needles:
+                    lines = found[needle]
+                    if len(lines) < MAX_MATCHING_LINES and needle in raw:
+                        if line is None:
+                            line = raw.decode(errors="replace")
+                        lines.append(line)
+                        if len(lines) == MAX_MATCHING_LINES:
+                            open_needles -= 1
+                match = pattern.search(mm, line_end + 1)
+    return found
+
+def _collect_lines(task_ids, dir_signature):
+    needles = [task_id.encode() for task_id in task_ids]
+    pattern = re.compile(b"|".join(re.escape(needle) for needle in needles))
+    collected = {needle: [] for needle in needles}
+
+    paths = files_for(task_ids, dir_signature)
+    for found in map_files(_scan_log_file, paths, pattern, needles):
+        for needle, lines in found.items():
+            kept = collected[needle]
+            kept.extend(lines[:MAX_MATCHING_LINES - len(kept)])
+
+    return {task_id: collected[task_id.encode()] for task_id in task_ids}
+
+def _log_dir_signature(log_dir):
+    # (path, mtime, size) for every log file; any write changes the signature
+    signature = []
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".log") and entry.is_file():
+                stat = entry.stat()
+                signature.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+@functools.lru_cache(maxsize=512)
+def _cached_analyze(task_id, dir_signature):
+    matching_lines = _prefetched_lines.pop((task_id, dir_signature), None)
+    if matching_lines is None:
+        matching_lines = _collect_lines([task_id], dir_signature)[task_id]
+
+    if not matching_lines:
+        return f"No log entries found for task {task_id}."
+
+    summary = classify_log_error(matching_lines)
+    return summary
+
 class LogAgent:
     def analyze_logs(self, context):
-        task_id = context.get("task_id")
-        log_dir = "data/logs"
-        matching_lines = []
-
-        for filename in os.listdir(log_dir):
-            if filename.endswith(".log"):
-                with open(os.path.join(log_dir, filename), "r") as file:
-                    for line in file:
-                        if task_id in line:
-                            matching_lines.append(line.strip())
+        task_id = context.task_id
+        return _cached_analyze(task_id, _log_dir_signature(LOG_DIR))
+
+    def prefetch(self, task_ids):
+        # Read every log file once for the whole batch of task ids
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return
+        dir_signature = _log_dir_signature(LOG_DIR)
+        _prefetched_lines.clear()
+        for task_id, lines in _collect_lines(task_ids, dir_signature).items():
+            _prefetched_lines[(task_id, dir_signature)] = lines
 
-        if not matching_lines:
-            return f"No log entries found for task {task_id}."
+# multi_agent_ops_ai/tools/log_tools.py
+import re
 
-        summary = classify_log_error(matching_lines)
-        return summary
+ERROR_KEYWORDS = ("exception", "traceback", "fail", "error")
+# One pass over each line finds every keyword; the keywords never overlap
+_ERROR_RE = re.compile("|".join(ERROR_KEYWORDS), re.IGNORECASE)
 
-# multi_agent_ops_ai/tools/log_tools.py
 def classify_log_error(log_lines):
-    error_keywords = ["exception", "traceback", "fail", "error"]
     issues = []
 
     for line in log_lines:
-        for keyword in error_keywords:
-            if keyword in line.lower():
+        found = {match.group(0).lower() for match in _ERROR_RE.finditer(line)}
+        if not found:
+            continue
+        for keyword in ERROR_KEYWORDS:
+            if keyword in found:
                 issues.append(f"Detected {keyword}: {line}")
 
     if not issues:
@@ -123,13 +279,126 @@ def classify_log_error(log_lines):
 
     return "\n".join(issues)
 
+# multi_agent_ops_ai/tools/log_index.py
+import bisect
+import mmap
+import os
+import pickle
+import re
+import threading
+from tools.file_reader import map_files
+
+INDEX_PATH = "data/log_index.pickle"
+
+_TID_RE = re.compile(rb"TID[-_]?\d+")
+_lock = threading.Lock()
+
+# path -> ((mtime_ns, size), sorted task ids seen in that file)
+_files = None
+
+def _scan_task_ids(path):
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return tuple(sorted({match.decode() for match in _TID_RE.findall(mm)}))
+
+def _load_index():
+    try:
+        with open(INDEX_PATH, "rb") as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+
+def _save_index(files):
+    try:
+        tmp_path = INDEX_PATH + ".tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(files, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, INDEX_PATH)
+    except OSError:
+        pass
+
+def _refresh(dir_signature):
+    # Rescan only the files whose mtime or size moved since they were indexed
+    global _files
+    if _files is None:
+        _files = _load_index()
+
+    current = {path: (mtime, size) for path, mtime, size in dir_signature}
+    stale = [path for path, stamp in current.items() if _files.get(path, (None,))[0] != stamp]
+    removed = _files.keys() - current.keys()
+    if not stale and not removed:
+        return
+
+    for path, task_ids in zip(stale, map_files(_scan_task_ids, stale)):
+        _files[path] = (current[path], task_ids)
+    for path in removed:
+        del _files[path]
+    _save_index(_files)
+
+def _has_prefix(task_ids, prefix):
+    i = bisect.bisect_left(task_ids, prefix)
+    return i < len(task_ids) and task_ids[i].startswith(prefix)
+
+def files_for(task_ids, dir_signature):
+    # A task id found anywhere in a line starts one of the indexed ids
+    # (TID-1 inside TID-12345), so a prefix hit keeps substring matching intact.
+    # Ids the index cannot see fall back to every file.
+    paths = [path for path, _, _ in dir_signature]
+    if not all(_TID_RE.fullmatch(task_id.encode()) for task_id in task_ids):
+        return paths
+
+    with _lock:
+        _refresh(dir_signature)
+        return [
+            path for path in paths
+            if any(_has_prefix(_files[path][1], task_id) for task_id in task_ids)
+        ]
+
+
 # multi_agent_ops_ai/agents/code_agent.py
+import bisect
+import functools
+import os
+import re
 from tools.code_tools import analyze_code_snippets
+from tools.file_reader import map_files
+
+CODEBASE_DIR = "data/codebase"
+SNIPPET_BYTES = 500
+
+def _read_code_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _code_dir_signature(codebase_dir):
+    # (path, mtime, size) for every source file; any write changes the signature
+    signature = []
+    with os.scandir(codebase_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith((".java", ".py")) and entry.is_file():
+                stat = entry.stat()
+                signature.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+@functools.lru_cache(maxsize=1)
+def _packed_codebase(dir_signature):
+    # Every source file back to back in one NUL-separated buffer, plus the
+    # offset where each file starts, so a query is one scan over one buffer
+    buffer = bytearray()
+    offsets = []
+    paths = [path for path, _, _ in dir_signature]
+    for data in map_files(_read_code_file, paths):
+        offsets.append(len(buffer))
+        buffer += data
+        buffer += b"\0"
+    return bytes(buffer), offsets
 
 class CodeAgent:
     def analyze_code(self, context):
-        task_id = context.get("task_id")
-        error_summary = context.get("log_summary", "")
+        task_id = context.task_id
+        error_summary = context.log_summary or ""
 
         # Simulate finding relevant code from error summary
         code_context = self.retrieve_relevant_code(task_id, error_summary)
@@ -138,16 +407,23 @@ class CodeAgent:
 
     def retrieve_relevant_code(self, task_id, error_summary):
         # Placeholder for filtering files from data/codebase/
-        import os
-        codebase_dir = "data/codebase"
         code_snippets = []
 
-        for filename in os.listdir(codebase_dir):
-            if filename.endswith(".java") or filename.endswith(".py"):
-                with open(os.path.join(codebase_dir, filename), "r") as f:
-                    snippet = f.read()
-                    if task_id in snippet or any(term in snippet for term in error_summary.split()):
-                        code_snippets.append(snippet[:500])  # Take first 500 chars
+        terms = [re.escape(term.encode()) for term in dict.fromkeys([task_id, *error_summary.split()]) if term]
+        if not terms:
+            return code_snippets
+        pattern = re.compile(b"|".join(terms))
+
+        buffer, offsets = _packed_codebase(_code_dir_signature(CODEBASE_DIR))
+        match = pattern.search(buffer)
+        while match:
+            # Map the hit back to its file, keep that file's preview and
+            # resume the scan at the next file
+            i = bisect.bisect_right(offsets, match.start()) - 1
+            start = offsets[i]
+            end = offsets[i + 1] - 1 if i + 1 < len(offsets) else len(buffer) - 1
+            code_snippets.append(buffer[start:min(start + SNIPPET_BYTES, end)].decode(errors="ignore"))
+            match = pattern.search(buffer, end + 1)
 
         return code_snippets
 
@@ -163,13 +439,30 @@ def analyze_code_snippets(snippets, error_summary):
     results.append("Potential cause based on log summary: " + error_summary[:150] + "...")
     return "\n".join(results)
 
+# multi_agent_ops_ai/tools/file_reader.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# File reads release the GIL, so threads overlap the IO of independent files
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def map_files(func, paths, *args):
+    # Submit every read at once and collect results in path order; a single
+    # file is read inline since a pool buys nothing there
+    if len(paths) < 2:
+        return [func(path, *args) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(paths))) as executor:
+        return list(executor.map(func, paths, *(repeat(arg) for arg in args)))
+
 
 # multi_agent_ops_ai/agents/database_agent.py
 from tools.db_tools import fetch_task_metrics
 
 class DatabaseAgent:
     def query_metrics(self, context):
-        task_id = context.get("task_id")
+        task_id = context.task_id
         metrics = fetch_task_metrics(task_id)
         if not metrics:
             return f"No database metrics found for task {task_id}."
@@ -178,21 +471,56 @@ class DatabaseAgent:
 
 
 # multi_agent_ops_ai/tools/db_tools.py
+import atexit
 import sqlite3
+import threading
+
+METRICS_DB = "data/metrics.db"
+_METRICS_SQL = """
+    SELECT start_time, end_time, duration
+    FROM task_metrics
+    WHERE task_id = ?
+"""
+
+# One connection for the whole process, shared behind a lock and closed once at
+# exit, so short-lived worker threads never leave connections behind. sqlite3
+# reuses the prepared statement for the identical SQL string on every call.
+_conn = None
+_lock = threading.Lock()
+
+def _close_connection():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+atexit.register(_close_connection)
+
+def _get_connection():
+    # Callers hold _lock
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(METRICS_DB, isolation_level=None, check_same_thread=False)
+        try:
+            conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-64000;
+            """)
+            # Idempotent, and runs only when the shared connection is first
+            # opened, so lookups by task_id never fall back to a table scan
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_metrics_task_id ON task_metrics(task_id)")
+        except Exception:
+            conn.close()
+            raise
+        _conn = conn
+    return _conn
 
 def fetch_task_metrics(task_id):
-    conn = sqlite3.connect("data/metrics.db")
-    cursor = conn.cursor()
-
     try:
-        cursor.execute("""
-            SELECT start_time, end_time, duration
-            FROM task_metrics
-            WHERE task_id = ?
-        """, (task_id,))
-
-        row = cursor.fetchone()
-        conn.close()
+        with _lock:
+            row = _get_connection().execute(_METRICS_SQL, (task_id,)).fetchone()
 
         if row:
             return {
@@ -204,7 +532,6 @@ def fetch_task_metrics(task_id):
             return None
 
     except Exception as e:
-        conn.close()
         return None
 
 
@@ -213,28 +540,73 @@ from tools.incident_tools import search_similar_incidents
 
 class IncidentAgent:
     def search_history(self, context):
-        task_id = context.get("task_id")
-        summary = context.get("log_summary", "")
+        task_id = context.task_id
+        summary = context.log_summary or ""
         results = search_similar_incidents(task_id, summary)
         return results
 
 
 # multi_agent_ops_ai/tools/incident_tools.py
-import pandas as pd
+import collections
+import csv
+import functools
+import os
+import re
+
+INCIDENTS_CSV = "data/incidents.csv"
+SUMMARY_CHARS = 50
+
+_TOKEN_RE = re.compile(r"\w+")
+
+@functools.lru_cache(maxsize=1)
+def _load_incidents(path, mtime):
+    # mtime is part of the cache key so an edited CSV is reloaded
+    rows = []
+    index = collections.defaultdict(list)
+    with open(path, newline="") as file:
+        for i, row in enumerate(csv.DictReader(file)):
+            desc_lower = (row.get("description") or "").lower()
+            rows.append((row, desc_lower))
+            for token in set(_TOKEN_RE.findall(desc_lower)):
+                index[token].append(i)
+    return rows, index
+
+def _lookup(rows, index, term):
+    # Rows whose description contains term. Inner words of the term must be whole
+    # words in the description; the outer ones may be cut off mid-word, so they
+    # match by suffix/prefix (or substring, for a one-word term). The whole term
+    # is then confirmed on the few candidates that are left.
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        candidates = range(len(rows))
+    else:
+        def postings(matches):
+            return set().union(*(ids for token, ids in index.items() if matches(token)))
+
+        first, last = tokens[0], tokens[-1]
+        if len(tokens) == 1:
+            candidates = postings(lambda token: first in token)
+        else:
+            candidates = postings(lambda token: token.endswith(first)) & postings(lambda token: token.startswith(last))
+            for token in tokens[1:-1]:
+                candidates &= set(index.get(token, ()))
+    # Like str.contains, an empty term matches every row with a description
+    return [rows[i][0] for i in sorted(candidates) if rows[i][1] and term in rows[i][1]]
 
 def search_similar_incidents(task_id, error_summary):
     try:
-        df = pd.read_csv("data/incidents.csv")
-        matched = df[df['description'].str.contains(task_id, case=False, na=False)]
+        rows, index = _load_incidents(INCIDENTS_CSV, os.path.getmtime(INCIDENTS_CSV))
+
+        matched = _lookup(rows, index, task_id.lower())
 
-        if matched.empty:
-            matched = df[df['description'].str.contains(error_summary[:50], case=False, na=False)]
+        if not matched:
+            matched = _lookup(rows, index, error_summary[:SUMMARY_CHARS].lower())
 
-        if matched.empty:
+        if not matched:
             return f"No similar incidents found for task {task_id}."
 
         incidents = []
-        for _, row in matched.iterrows():
+        for row in matched:
             incidents.append(f"Date: {row['date']}, Summary: {row['description']}")
 
         return "\n".join(incidents)
@@ -248,9 +620,9 @@ from tools.jira_tools import create_jira_ticket
 
 class JiraAgent:
     def create_ticket(self, context):
-        task_id = context.get("task_id")
-        error_summary = context.get("log_summary", "")
-        code_analysis = context.get("code_analysis", "")
+        task_id = context.task_id
+        error_summary = context.log_summary or ""
+        code_analysis = context.code_analysis or ""
         return create_jira_ticket(task_id, error_summary, code_analysis)
 
 
@@ -4,6 +4,42 @@ from langchain_openai import ChatOpenAI
 from tools.code_tools import CodeAnalysisTool
 from typing import List
 
+_CODE_TASK_PROMPT = """
+            Analyze codebase for issues related to the task identified below and log findings:
+            
+            PRIMARY OBJECTIVES:
+            1. Locate code files relevant to the task ID or error patterns from logs
+            2. Perform static code analysis for common bug patterns
+            3. Identify potential null pointer exceptions, resource leaks, timeout issues
+            4. Review error handling and exception management patterns
+            5. Analyze threading and concurrency issues
+            6. Suggest specific code improvements and fixes
+            
+            ANALYSIS FOCUS:
+            - Null safety and defensive programming practices
+            - Resource management (connections, memory, files, threads)
+            - Error handling patterns and exception propagation
+            - Performance bottlenecks and inefficient algorithms
+            - Security vulnerabilities and input validation
+            - Memory leaks and resource cleanup
+            - Threading and synchronization issues
+            
+            CODE REVIEW CHECKLIST:
+            - Check for null pointer dereferences
+            - Validate resource cleanup in finally blocks
+            - Review exception handling completeness
+            - Identify performance anti-patterns
+            - Look for SQL injection vulnerabilities
+            - Check for race conditions and deadlocks
+            
+            DELIVERABLES:
+            - Code issue summary with severity ratings (Critical, High, Medium, Low)
+            - Specific file names, line numbers, and problematic code sections
+            - Detailed explanation of each identified issue
+            - Recommended fixes with code examples where applicable
+            - Prevention strategies for similar issues in the future
+            """
+
 class CodeAnalysisAgent:
     """Agent specialized in analyzing code for bugs and issues"""
     
@@ -37,43 +73,8 @@ class CodeAnalysisAgent:
             context_note = "Use the log analysis results to focus your code review on specific areas mentioned in error messages."
         
         return Task(
-            description=f"""
-            Analyze codebase for issues related to task {task_id} and log findings:
-            
-            PRIMARY OBJECTIVES:
-            1. Locate code files relevant to {task_id} or error patterns from logs
-            2. Perform static code analysis for common bug patterns
-            3. Identify potential null pointer exceptions, resource leaks, timeout issues
-            4. Review error handling and exception management patterns
-            5. Analyze threading and concurrency issues
-            6. Suggest specific code improvements and fixes
-            
-            ANALYSIS FOCUS:
-            - Null safety and defensive programming practices
-            - Resource management (connections, memory, files, threads)
-            - Error handling patterns and exception propagation
-            - Performance bottlenecks and inefficient algorithms
-            - Security vulnerabilities and input validation
-            - Memory leaks and resource cleanup
-            - Threading and synchronization issues
-            
-            CODE REVIEW CHECKLIST:
-            - Check for null pointer dereferences
-            - Validate resource cleanup in finally blocks
-            - Review exception handling completeness
-            - Identify performance anti-patterns
-            - Look for SQL injection vulnerabilities
-            - Check for race conditions and deadlocks
-            
+            description=_CODE_TASK_PROMPT + f"""
             {context_note}
-            
-            DELIVERABLES:
-            - Code issue summary with severity ratings (Critical, High, Medium, Low)
-            - Specific file names, line numbers, and problematic code sections
-            - Detailed explanation of each identified issue
-            - Recommended fixes with code examples where applicable
-            - Prevention strategies for similar issues in the future
-            
             User Query: {user_query}
             Task ID: {task_id}
             """,
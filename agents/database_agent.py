@@ -3,40 +3,11 @@ from crewai import Agent, Task
 from langchain_openai import ChatOpenAI
 from tools.db_tools import DatabaseMetricsTool
 
-class DatabaseMetricsAgent:
-    """Agent specialized in analyzing database metrics and performance data"""
-    
-    def __init__(self, llm: ChatOpenAI):
-        """Initialize the database metrics agent"""
-        self.llm = llm
-        self.tool = DatabaseMetricsTool()
-        self.agent = self._create_agent()
-    
-    def _create_agent(self) -> Agent:
-        """Create the database metrics agent with proper configuration"""
-        return Agent(
-            role="Database Performance Specialist",
-            goal="Analyze database metrics, identify performance bottlenecks, and correlate metrics with system issues",
-            backstory="""You are a database expert and performance analyst with 12+ years of experience 
-            in database optimization, query tuning, and system performance monitoring. You understand 
-            how to interpret system metrics, identify performance bottlenecks, correlate metrics 
-            with application issues, and recommend database-level optimizations. You excel at 
-            identifying patterns in performance data that indicate systemic problems.""",
-            tools=[self.tool],
-            llm=self.llm,
-            verbose=True,
-            allow_delegation=False
-        )
-    
-    def create_task(self, user_query: str, task_id: str) -> Task:
-        """Create a database metrics analysis task"""
-        
-        return Task(
-            description=f"""
-            Retrieve and analyze performance metrics for task {task_id}:
+_DB_TASK_PROMPT = """
+            Retrieve and analyze performance metrics for the task identified below:
             
             PRIMARY OBJECTIVES:
-            1. Query database for all metrics related to {task_id}
+            1. Query database for all metrics related to the task ID
             2. Analyze execution timing, duration, and resource utilization patterns
             3. Identify performance anomalies and bottlenecks
             4. Compare current metrics with baseline performance data
@@ -71,12 +42,44 @@ class DatabaseMetricsAgent:
             - Performance impact assessment of identified issues
             - Capacity planning recommendations
             - Database optimization suggestions
-            
+            """
+
+class DatabaseMetricsAgent:
+    """Agent specialized in analyzing database metrics and performance data"""
+    
+    def __init__(self, llm: ChatOpenAI):
+        """Initialize the database metrics agent"""
+        self.llm = llm
+        self.tool = DatabaseMetricsTool()
+        self.agent = self._create_agent()
+    
+    def _create_agent(self) -> Agent:
+        """Create the database metrics agent with proper configuration"""
+        return Agent(
+            role="Database Performance Specialist",
+            goal="Analyze database metrics, identify performance bottlenecks, and correlate metrics with system issues",
+            backstory="""You are a database expert and performance analyst with 12+ years of experience 
+            in database optimization, query tuning, and system performance monitoring. You understand 
+            how to interpret system metrics, identify performance bottlenecks, correlate metrics 
+            with application issues, and recommend database-level optimizations. You excel at 
+            identifying patterns in performance data that indicate systemic problems.""",
+            tools=[self.tool],
+            llm=self.llm,
+            verbose=True,
+            allow_delegation=False
+        )
+    
+    def create_task(self, user_query: str, task_id: str, async_execution: bool = False) -> Task:
+        """Create a database metrics analysis task"""
+        
+        return Task(
+            description=_DB_TASK_PROMPT + f"""
             User Query: {user_query}
             Task ID: {task_id}
             """,
             agent=self.agent,
-            expected_output="Performance metrics analysis with anomaly detection, correlation findings, and optimization recommendations"
+            expected_output="Performance metrics analysis with anomaly detection, correlation findings, and optimization recommendations",
+            async_execution=async_execution
         )
     
     def get_agent(self) -> Agent:
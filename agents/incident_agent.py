@@ -4,47 +4,8 @@ from langchain_openai import ChatOpenAI
 from tools.incident_tools import IncidentHistoryTool
 from typing import List
 
-class IncidentHistoryAgent:
-    """Agent specialized in researching historical incidents and resolutions"""
-    
-    def __init__(self, llm: ChatOpenAI):
-        """Initialize the incident history agent"""
-        self.llm = llm
-        self.tool = IncidentHistoryTool()
-        self.agent = self._create_agent()
-    
-    def _create_agent(self) -> Agent:
-        """Create the incident history agent with proper configuration"""
-        return Agent(
-            role="Senior Incident Management Specialist",
-            goal="Research historical incidents, identify patterns, and provide proven resolution strategies",
-            backstory="""You are a senior Site Reliability Engineer (SRE) with extensive experience 
-            in incident response, post-mortem analysis, and knowledge management. You have 10+ years 
-            of experience managing complex system incidents and excel at finding patterns in historical 
-            data, identifying root causes, and predicting potential issues. You have a deep understanding 
-            of incident lifecycle management and are skilled at extracting actionable insights from past 
-            incidents to prevent future occurrences.""",
-            tools=[self.tool],
-            llm=self.llm,
-            verbose=True,
-            allow_delegation=False
-        )
-    
-    def create_task(self, user_query: str, task_id: str, context: List[Task] = None) -> Task:
-        """Create an incident history research task"""
-        
-        context_note = ""
-        if context:
-            context_note = """
-            CONTEXT INTEGRATION:
-            Use insights from log analysis and code review to refine search terms and improve 
-            relevance of historical incident matches. Focus on incidents with similar error 
-            patterns, code issues, or system behaviors.
-            """
-        
-        return Task(
-            description=f"""
-            Research historical incidents similar to current {task_id} issue:
+_INCIDENT_TASK_PROMPT = """
+            Research historical incidents similar to the current issue for the task identified below:
             
             PRIMARY OBJECTIVES:
             1. Search incident database for similar error patterns and symptoms
@@ -85,8 +46,6 @@ class IncidentHistoryAgent:
             - Analyze blast radius and impact scope predictions
             - Review dependencies and cascade failure potential
             
-            {context_note}
-            
             DELIVERABLES:
             - Historical incident summary with relevance scoring
             - Pattern analysis report with frequency and trend data
@@ -95,7 +54,49 @@ class IncidentHistoryAgent:
             - Preventive measure recommendations based on lessons learned
             - Escalation pathway suggestions based on similar incident handling
             - Knowledge base updates and documentation improvement suggestions
-            
+            """
+
+class IncidentHistoryAgent:
+    """Agent specialized in researching historical incidents and resolutions"""
+    
+    def __init__(self, llm: ChatOpenAI):
+        """Initialize the incident history agent"""
+        self.llm = llm
+        self.tool = IncidentHistoryTool()
+        self.agent = self._create_agent()
+    
+    def _create_agent(self) -> Agent:
+        """Create the incident history agent with proper configuration"""
+        return Agent(
+            role="Senior Incident Management Specialist",
+            goal="Research historical incidents, identify patterns, and provide proven resolution strategies",
+            backstory="""You are a senior Site Reliability Engineer (SRE) with extensive experience 
+            in incident response, post-mortem analysis, and knowledge management. You have 10+ years 
+            of experience managing complex system incidents and excel at finding patterns in historical 
+            data, identifying root causes, and predicting potential issues. You have a deep understanding 
+            of incident lifecycle management and are skilled at extracting actionable insights from past 
+            incidents to prevent future occurrences.""",
+            tools=[self.tool],
+            llm=self.llm,
+            verbose=True,
+            allow_delegation=False
+        )
+    
+    def create_task(self, user_query: str, task_id: str, context: List[Task] = None) -> Task:
+        """Create an incident history research task"""
+        
+        context_note = ""
+        if context:
+            context_note = """
+            CONTEXT INTEGRATION:
+            Use insights from log analysis and code review to refine search terms and improve 
+            relevance of historical incident matches. Focus on incidents with similar error 
+            patterns, code issues, or system behaviors.
+            """
+        
+        return Task(
+            description=_INCIDENT_TASK_PROMPT + f"""
+            {context_note}
             User Query: {user_query}
             Task ID: {task_id}
             """,
@@ -2,55 +2,10 @@
 from crewai import Agent, Task
 from langchain_openai import ChatOpenAI
 from tools.jira_tools import JiraTicketTool
-from typing import List
+from typing import Dict, List
 
-class JiraTicketAgent:
-    """Agent specialized in creating comprehensive JIRA tickets for operational issues"""
-    
-    def __init__(self, llm: ChatOpenAI):
-        """Initialize the JIRA ticket agent"""
-        self.llm = llm
-        self.tool = JiraTicketTool()
-        self.agent = self._create_agent()
-    
-    def _create_agent(self) -> Agent:
-        """Create the JIRA ticket agent with proper configuration"""
-        return Agent(
-            role="Senior Technical Project Manager & Documentation Specialist",
-            goal="Create comprehensive, actionable JIRA tickets that consolidate all analysis findings and provide clear resolution pathways",
-            backstory="""You are a senior technical project manager with 12+ years of experience 
-            in incident management, technical documentation, and cross-functional team coordination. 
-            You excel at synthesizing complex technical information into clear, actionable work items 
-            that development, operations, and support teams can execute effectively. You understand 
-            JIRA best practices, ticket lifecycle management, and have expertise in creating detailed 
-            user stories, acceptance criteria, and technical specifications. You are skilled at 
-            prioritizing work, estimating effort, and ensuring proper tracking and accountability.""",
-            tools=[self.tool],
-            llm=self.llm,
-            verbose=True,
-            allow_delegation=False
-        )
-    
-    def create_task(self, user_query: str, task_id: str, context: List[Task] = None) -> Task:
-        """Create a JIRA ticket creation task based on all previous analysis"""
-        
-        context_note = ""
-        if context:
-            context_note = """
-            CONTEXT INTEGRATION:
-            Synthesize findings from all previous analysis tasks:
-            - Log analysis results (error patterns, timelines, severity)
-            - Code review findings (bugs, security issues, technical debt)
-            - Performance metrics analysis (bottlenecks, resource utilization)
-            - Historical incident research (patterns, proven solutions, preventive measures)
-            
-            Use these inputs to create a comprehensive, well-structured JIRA ticket that serves 
-            as the single source of truth for resolving this operational issue.
-            """
-        
-        return Task(
-            description=f"""
-            Create comprehensive JIRA ticket(s) for resolving {task_id} operational issue:
+_JIRA_TASK_PROMPT = """
+            Create comprehensive JIRA ticket(s) for resolving the operational issue of the task identified below:
             
             PRIMARY OBJECTIVES:
             1. Synthesize all analysis findings into coherent problem statement
@@ -132,8 +87,6 @@ class JiraTicketAgent:
             - Process improvements and automation opportunities
             - Knowledge base updates and documentation requirements
             
-            {context_note}
-            
             DELIVERABLES:
             - Primary JIRA ticket with comprehensive problem documentation
             - Subtask breakdown with clear ownership and timelines
@@ -149,15 +102,77 @@ class JiraTicketAgent:
             - Resource estimates should be realistic and well-justified
             - All findings from previous analysis must be properly integrated
             - Ticket must follow organizational JIRA standards and templates
-            
+            """
+
+# The findings it refers to are already itemized under ANALYSIS FINDINGS above
+_JIRA_CONTEXT_NOTE = """
+            CONTEXT INTEGRATION:
+            Synthesize the log, code, metrics and incident findings from all previous 
+            analysis tasks into the ANALYSIS FINDINGS section, so the ticket serves as 
+            the single source of truth for resolving this operational issue.
+            """
+
+# Filled from the kickoff inputs once the upstream analysis has finished
+_JIRA_BRIEF_SLOT = """
+            ANALYSIS BRIEF:
+{analysis_brief}
+            """
+
+class JiraTicketAgent:
+    """Agent specialized in creating comprehensive JIRA tickets for operational issues"""
+    
+    def __init__(self, llm: ChatOpenAI):
+        """Initialize the JIRA ticket agent"""
+        self.llm = llm
+        self.tool = JiraTicketTool()
+        self.agent = self._create_agent()
+    
+    def _create_agent(self) -> Agent:
+        """Create the JIRA ticket agent with proper configuration"""
+        return Agent(
+            role="Senior Technical Project Manager & Documentation Specialist",
+            goal="Create comprehensive, actionable JIRA tickets that consolidate all analysis findings and provide clear resolution pathways",
+            backstory="""You are a senior technical project manager with 12+ years of experience 
+            in incident management, technical documentation, and cross-functional team coordination. 
+            You excel at synthesizing complex technical information into clear, actionable work items 
+            that development, operations, and support teams can execute effectively. You understand 
+            JIRA best practices, ticket lifecycle management, and have expertise in creating detailed 
+            user stories, acceptance criteria, and technical specifications. You are skilled at 
+            prioritizing work, estimating effort, and ensuring proper tracking and accountability.""",
+            tools=[self.tool],
+            llm=self.llm,
+            verbose=True,
+            allow_delegation=False
+        )
+    
+    def create_task(self, user_query: str, task_id: str, context: List[Task] = None, findings_brief: bool = False) -> Task:
+        """Create a JIRA ticket creation task based on all previous analysis
+        
+        With findings_brief, the task takes no context tasks; instead its
+        description has an {analysis_brief} slot, filled through the kickoff
+        inputs with format_findings. Run it in a crew of its own, since CrewAI
+        hands a task without context every earlier output of its crew.
+        """
+        
+        context_note = _JIRA_CONTEXT_NOTE if context or findings_brief else ""
+        brief_slot = _JIRA_BRIEF_SLOT if findings_brief else ""
+        
+        return Task(
+            description=_JIRA_TASK_PROMPT + f"""
+            {context_note}
             User Query: {user_query}
             Task ID: {task_id}
-            """,
+            """ + brief_slot,
             agent=self.agent,
             expected_output="Complete JIRA ticket creation with comprehensive problem documentation, detailed resolution strategy, clear acceptance criteria, and actionable work breakdown structure",
             context=context or []
         )
     
+    @staticmethod
+    def format_findings(findings: Dict[str, str]) -> str:
+        """Render distilled findings for the {analysis_brief} slot of a briefed task"""
+        return "\n".join(f"            {name.upper()}: {finding}" for name, finding in findings.items())
+    
     def get_agent(self) -> Agent:
         """Get the agent instance"""
         return self.agent
@@ -3,6 +3,30 @@ from crewai import Agent, Task
 from langchain_openai import ChatOpenAI
 from tools.log_tools import LogAnalysisTool
 
+# Task descriptions keep their static instructions first and the per-query
+# details last, so repeated runs share a prompt prefix the provider can cache
+_LOG_TASK_PROMPT = """
+            Perform comprehensive log analysis for the task identified below:
+            
+            PRIMARY OBJECTIVES:
+            1. Search all log files for entries related to the task ID
+            2. Identify and classify all errors, warnings, and exceptions
+            3. Create a timeline of events leading to the issue
+            4. Extract stack traces and error messages
+            5. Determine error severity and impact
+            
+            ANALYSIS FOCUS:
+            - Look for: exceptions, timeouts, connection failures, null pointer errors
+            - Timeline reconstruction from log timestamps
+            - Error pattern correlation across multiple log files
+            
+            DELIVERABLES:
+            - Complete error timeline with timestamps
+            - Error classification and severity assessment
+            - Key error messages and stack traces
+            - Potential root cause hypotheses based on log patterns
+            """
+
 class LogAnalysisAgent:
     """Agent specialized in analyzing system logs for errors and patterns"""
     
@@ -28,45 +52,33 @@ class LogAnalysisAgent:
             allow_delegation=False
         )
     
-    def create_task(self, user_query: str, task_id: str, is_performance_query: bool = False, is_error_query: bool = False) -> Task:
-        """Create a log analysis task based on the user query"""
-        
+    @staticmethod
+    def analysis_focus(is_performance_query: bool = False, is_error_query: bool = False) -> str:
+        """Describe what the log analysis should focus on for a query"""
         analysis_focus = []
         if is_performance_query:
             analysis_focus.append("performance issues and bottlenecks")
         if is_error_query:
             analysis_focus.append("error patterns and exception traces")
         
-        focus_text = ", ".join(analysis_focus) if analysis_focus else "general error patterns"
+        return ", ".join(analysis_focus) if analysis_focus else "general error patterns"
+    
+    def create_task(self, user_query: str, task_id: str, is_performance_query: bool = False, is_error_query: bool = False, async_execution: bool = False, focus_text: str = None) -> Task:
+        """Create a log analysis task based on the user query"""
+        
+        if focus_text is None:
+            focus_text = self.analysis_focus(is_performance_query, is_error_query)
         
         return Task(
-            description=f"""
-            Perform comprehensive log analysis for task {task_id}:
-            
-            PRIMARY OBJECTIVES:
-            1. Search all log files for entries related to {task_id}
-            2. Identify and classify all errors, warnings, and exceptions
-            3. Create a timeline of events leading to the issue
-            4. Extract stack traces and error messages
-            5. Determine error severity and impact
-            
-            ANALYSIS FOCUS:
-            - Primary focus: {focus_text}
-            - Look for: exceptions, timeouts, connection failures, null pointer errors
-            - Timeline reconstruction from log timestamps
-            - Error pattern correlation across multiple log files
-            
-            DELIVERABLES:
-            - Complete error timeline with timestamps
-            - Error classification and severity assessment
-            - Key error messages and stack traces
-            - Potential root cause hypotheses based on log patterns
+            description=_LOG_TASK_PROMPT + f"""
+            PRIMARY FOCUS: {focus_text}
             
             User Query: {user_query}
             Task ID: {task_id}
             """,
             agent=self.agent,
-            expected_output="Comprehensive log analysis report with error timeline, classification, and root cause hypotheses"
+            expected_output="Comprehensive log analysis report with error timeline, classification, and root cause hypotheses",
+            async_execution=async_execution
         )
     
     def get_agent(self) -> Agent:
@@ -12,113 +12,206 @@ from .incident_agent import IncidentHistoryAgent
 from .jira_agent import JiraTicketAgent
 from tools.analysis_utils import AnalysisUtils
 
+_TID_RE = re.compile(r"TID[-_]?\d+")
+# Headings a batched answer is split on, e.g. "### Sample 2 (TID-456)"
+_SAMPLE_HEADING_RE = re.compile(r"^#+\s*Sample\s+(\d+)[^\n]*$", re.MULTILINE)
+
+_BANNER = "━" * 48
+_SUMMARY_RULE = "━" * 43
+
+# Fixed closing block of every executive summary, joined once at import
+_SUMMARY_SCOPE = "\n".join([
+    "\n📊 ANALYSIS SCOPE:",
+    "   • Log files analyzed for error patterns",
+    "   • Code base reviewed for potential bugs",
+    "   • Performance metrics evaluated",
+    "   • Historical incidents researched",
+    "   • JIRA ticket prepared for tracking",
+    "\n🎫 NEXT STEPS: Review generated JIRA ticket for detailed action items",
+])
+
+# Keywords the executive summary reacts to; none overlaps another, so one
+# finditer pass sees every keyword present
+_SUMMARY_RE = re.compile(r"failed|error|warning|nullpointer|timeout|memory", re.IGNORECASE)
+
+# Lines worth keeping when an agent's output is distilled for the ticket
+_FINDING_LINE_RE = re.compile(
+    r"critical|high|error|exception|fail|timeout|root cause|recommend|fix", re.IGNORECASE
+)
+
+def _distill_output(text: str) -> str:
+    """Reduce an agent's output to its key finding lines, within the brief budget"""
+    lines = [line.strip(" -*#\t") for line in text.splitlines()]
+    key_lines = [line for line in lines if line and _FINDING_LINE_RE.search(line)]
+    brief = "; ".join(key_lines or [line for line in lines if line])
+    return brief[:Config.MAX_FINDING_BRIEF_CHARS]
+
+# Finding name of each analysis task, in crew order, and the order of the brief
+_TASK_FINDINGS = ("log", "metrics", "code", "incidents")
+_FINDING_ORDER = ("log", "code", "metrics", "incidents")
+
+def _extract_task_id(user_query: str) -> str:
+    """Return the first task ID in the query, or UNKNOWN"""
+    task_id_match = _TID_RE.search(user_query)
+    return task_id_match.group(0) if task_id_match else "UNKNOWN"
+
 class OpsAnalysisOrchestrator:
     """Main orchestrator that coordinates all analysis agents"""
     
+    # LLM client and agents shared by every orchestrator in the process,
+    # each built the first time it is used
+    _shared: Dict[str, Any] = {}
+    
     def __init__(self):
-        """Initialize the orchestrator with all agents"""
+        """Initialize the orchestrator; agents are created on first use"""
         Config.validate_config()
         
-        self.llm = ChatOpenAI(
-            model=Config.LLM_MODEL,
+        self.analysis_results = {}
+        self._crews = None
+    
+    @classmethod
+    def _get_shared(cls, name: str, factory):
+        """Return the shared object called name, building it on first use"""
+        if name not in cls._shared:
+            cls._shared[name] = factory()
+        return cls._shared[name]
+    
+    @property
+    def llm(self) -> ChatOpenAI:
+        """Shared LLM client for the default model"""
+        return self._get_llm(Config.LLM_MODEL)
+    
+    def _get_llm(self, model: str) -> ChatOpenAI:
+        """Shared LLM client for a model; agents on the same model share one"""
+        return self._get_shared(f"llm:{model}", lambda: ChatOpenAI(
+            model=model,
             temperature=Config.LLM_TEMPERATURE,
             api_key=Config.OPENAI_API_KEY
-        )
-        
-        # Initialize all agents
-        self.log_agent = LogAnalysisAgent(self.llm)
-        self.code_agent = CodeAnalysisAgent(self.llm)
-        self.db_agent = DatabaseMetricsAgent(self.llm)
-        self.incident_agent = IncidentHistoryAgent(self.llm)
-        self.jira_agent = JiraTicketAgent(self.llm)
-        
-        self.analysis_results = {}
+        ))
     
-    def create_analysis_tasks(self, user_query: str):
-        """Create enhanced tasks with better context and dependencies"""
-        
-        # Extract task ID and classify query type
-        task_id_match = re.search(r"TID[-_]?\d+", user_query)
-        task_id = task_id_match.group(0) if task_id_match else "UNKNOWN"
-        
-        query_lower = user_query.lower()
-        is_performance_query = any(word in query_lower for word in Config.PERFORMANCE_KEYWORDS)
-        is_error_query = any(word in query_lower for word in Config.ERROR_QUERY_KEYWORDS)
+    def _agent_llm(self, agent_key: str) -> ChatOpenAI:
+        """LLM client for the model tier configured for an agent"""
+        return self._get_llm(Config.MODEL_PER_AGENT.get(agent_key, Config.LLM_MODEL))
+    
+    @property
+    def log_agent(self) -> LogAnalysisAgent:
+        """Shared log analysis agent"""
+        return self._get_shared("log_agent", lambda: LogAnalysisAgent(self._agent_llm("log")))
+    
+    @property
+    def code_agent(self) -> CodeAnalysisAgent:
+        """Shared code analysis agent"""
+        return self._get_shared("code_agent", lambda: CodeAnalysisAgent(self._agent_llm("code")))
+    
+    @property
+    def db_agent(self) -> DatabaseMetricsAgent:
+        """Shared database metrics agent"""
+        return self._get_shared("db_agent", lambda: DatabaseMetricsAgent(self._agent_llm("db")))
+    
+    @property
+    def incident_agent(self) -> IncidentHistoryAgent:
+        """Shared incident history agent"""
+        return self._get_shared("incident_agent", lambda: IncidentHistoryAgent(self._agent_llm("incident")))
+    
+    @property
+    def jira_agent(self) -> JiraTicketAgent:
+        """Shared JIRA ticket agent"""
+        return self._get_shared("jira_agent", lambda: JiraTicketAgent(self._agent_llm("jira")))
+    
+    def create_analysis_tasks(self, user_query: str, task_id: str, analysis_focus: str):
+        """Create the analysis tasks, in _TASK_FINDINGS order, and the JIRA task that follows them"""
         
-        # Create tasks for each agent
-        tasks = []
+        # Log and database analysis share no inputs, so both fan out as async
+        # tasks; the first synchronous task (code analysis) waits for both
         
         # Task 1: Log Analysis
-        log_task = self.log_agent.create_task(user_query, task_id, is_performance_query, is_error_query)
-        tasks.append(log_task)
+        log_task = self.log_agent.create_task(user_query, task_id, async_execution=True, focus_text=analysis_focus)
         
-        # Task 2: Code Analysis (depends on log analysis)
-        code_task = self.code_agent.create_task(user_query, task_id, context=[log_task])
-        tasks.append(code_task)
+        # Task 2: Database Metrics Analysis (runs alongside log analysis)
+        db_task = self.db_agent.create_task(user_query, task_id, async_execution=True)
         
-        # Task 3: Database Metrics Analysis
-        db_task = self.db_agent.create_task(user_query, task_id)
-        tasks.append(db_task)
+        # Task 3: Code Analysis (depends on log analysis)
+        code_task = self.code_agent.create_task(user_query, task_id, context=[log_task])
         
         # Task 4: Incident History Research (depends on log and code analysis)
         incident_task = self.incident_agent.create_task(user_query, task_id, context=[log_task, code_task])
-        tasks.append(incident_task)
         
-        # Task 5: JIRA Ticket Creation (depends on all previous tasks)
-        jira_task = self.jira_agent.create_task(user_query, task_id, context=[log_task, code_task, db_task, incident_task])
-        tasks.append(jira_task)
+        # Task 5: JIRA Ticket Creation (depends on all previous tasks). Rather than
+        # the four full outputs, it gets a distilled brief of each through its
+        # {analysis_brief} input, so it runs in a crew of its own after them
+        jira_task = self.jira_agent.create_task(user_query, task_id, findings_brief=True)
         
-        return tasks
+        return [log_task, db_task, code_task, incident_task], jira_task
+    
+    def _get_crews(self):
+        """Build the analysis and JIRA crews once; each run fills in its query through kickoff inputs"""
+        if self._crews is None:
+            analysis_tasks, jira_task = self.create_analysis_tasks("{user_query}", "{task_id}", "{analysis_focus}")
+            analysis_agents = [
+                self.log_agent.get_agent(),
+                self.db_agent.get_agent(),
+                self.code_agent.get_agent(),
+                self.incident_agent.get_agent(),
+            ]
+            self._crews = (
+                self._create_crew(analysis_agents, analysis_tasks),
+                self._create_crew([self.jira_agent.get_agent()], [jira_task]),
+            )
+        
+        return self._crews
+    
+    def _run_crews(self, inputs: Dict[str, str]):
+        """Run the analysis crew, distill its outputs, then brief the JIRA crew with them"""
+        analysis_crew, jira_crew = self._get_crews()
+        
+        analysis = analysis_crew.kickoff(inputs=inputs)
+        outputs = dict(zip(_TASK_FINDINGS, analysis.tasks_output))
+        self.analysis_results = {name: _distill_output(str(outputs[name])) for name in _FINDING_ORDER}
+        
+        # The brief is complete before the JIRA task starts
+        brief = self.jira_agent.format_findings(self.analysis_results)
+        return jira_crew.kickoff(inputs={**inputs, "analysis_brief": brief})
+    
+    def _analysis_inputs(self, user_query: str, task_id: str) -> Dict[str, str]:
+        """Classify the query and build the inputs for one crew run"""
+        is_performance_query = bool(Config.PERFORMANCE_RE.search(user_query))
+        is_error_query = bool(Config.ERROR_QUERY_RE.search(user_query))
+        
+        return {
+            "user_query": user_query,
+            "task_id": task_id,
+            "analysis_focus": LogAnalysisAgent.analysis_focus(is_performance_query, is_error_query),
+        }
     
     def execute_analysis(self, user_query: str) -> str:
         """Execute the complete operational analysis with enhanced reporting"""
         
         print(f"\n🤖 Multi-Agent Operational Intelligence System")
-        print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        print(_BANNER)
         print(f"📥 Query: {user_query}")
         print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # Extract task ID for tracking
-        task_id_match = re.search(r"TID[-_]?\d+", user_query)
-        task_id = task_id_match.group(0) if task_id_match else "UNKNOWN"
+        # Extract task ID once for tracking and task creation
+        task_id = _extract_task_id(user_query)
         
         print(f"🎯 Target Task: {task_id}")
         print(f"🔍 Analysis Type: Operational Intelligence")
         
         try:
-            # Create enhanced tasks
-            tasks = self.create_analysis_tasks(user_query)
-            
-            # Get all agent instances
-            agents = [
-                self.log_agent.get_agent(),
-                self.code_agent.get_agent(),
-                self.db_agent.get_agent(),
-                self.incident_agent.get_agent(),
-                self.jira_agent.get_agent()
-            ]
-            
-            # Create crew with sequential process for better context flow
-            crew = Crew(
-                agents=agents,
-                tasks=tasks,
-                process=Process.sequential,
-                verbose=True,
-                memory=True,  # Enable memory for better context retention
-            )
+            crews = self._get_crews()
             
             print(f"\n🚀 Initiating multi-agent analysis...")
-            print(f"👥 Agents: {len(agents)} specialized agents")
-            print(f"📋 Tasks: {len(tasks)} sequential analysis tasks")
+            print(f"👥 Agents: {sum(len(crew.agents) for crew in crews)} specialized agents")
+            print(f"📋 Tasks: {sum(len(crew.tasks) for crew in crews)} analysis tasks (log and metrics in parallel)")
             
-            # Execute the crew
-            result = crew.kickoff()
+            # Execute the crews
+            result = self._run_crews(self._analysis_inputs(user_query, task_id))
             
             # Generate final summary
             summary = self._generate_executive_summary(result, task_id)
             
             print(f"\n✅ Analysis Complete!")
-            print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            print(_BANNER)
             print(f"⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"\n{summary}")
             
@@ -129,30 +222,117 @@ class OpsAnalysisOrchestrator:
             print(error_msg)
             return error_msg
     
+    def execute_analysis_batch(self, user_queries: List[str]) -> List[str]:
+        """Analyze several queries in one crew run, with one batched task per agent"""
+        
+        print(f"\n🤖 Multi-Agent Operational Intelligence System (batch of {len(user_queries)})")
+        print(_BANNER)
+        print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        task_ids = []
+        samples = []
+        for i, user_query in enumerate(user_queries, 1):
+            task_id = _extract_task_id(user_query)
+            task_ids.append(task_id)
+            samples.append(f"### Sample {i} ({task_id})\n{user_query}")
+            print(f"📥 Sample {i}: {user_query}")
+        
+        # Every agent sees all samples in one task and answers them under the
+        # same numbered headings, so each agent makes one LLM pass per batch
+        batched_query = "\n".join(samples) + (
+            "\n\nAnalyze each sample independently and answer under matching "
+            "'### Sample N' headings, in order. Run your tools separately for each "
+            "sample, passing only the task ID named in that sample's heading."
+        )
+        # The tools take one task ID, so the list is only there to be read per sample
+        batch_task_ids = f"one per sample, in order: {', '.join(task_ids)}"
+        
+        try:
+            print(f"\n🚀 Initiating batched multi-agent analysis...")
+            result = self._run_crews(self._analysis_inputs(batched_query, batch_task_ids))
+            
+            results = self._split_batch_result(str(result), len(user_queries))
+            
+            for task_id, sample_result in zip(task_ids, results):
+                if not sample_result.startswith("❌"):
+                    print(f"\n{self._generate_executive_summary(sample_result, task_id)}")
+            
+            print(f"\n✅ Batch Analysis Complete!")
+            print(f"⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            
+            return results
+            
+        except Exception as e:
+            error_msg = f"❌ Batch analysis failed: {str(e)}"
+            print(error_msg)
+            return [error_msg] * len(user_queries)
+    
+    @staticmethod
+    def _split_batch_result(result: str, count: int) -> List[str]:
+        """Split a batched answer on its '### Sample N' headings"""
+        sections = {}
+        matches = list(_SAMPLE_HEADING_RE.finditer(result))
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            end = next_match.start() if next_match else len(result)
+            sections.setdefault(int(match.group(1)), result[match.end():end].strip())
+        
+        # A sample the model did not answer under its own heading fails rather
+        # than borrowing the answers to the others
+        return [
+            sections[i] if i in sections else f"❌ Batch analysis gave no separate answer for sample {i}"
+            for i in range(1, count + 1)
+        ]
+    
+    def _get_agents(self) -> list:
+        """Get all agent instances"""
+        return [
+            self.log_agent.get_agent(),
+            self.code_agent.get_agent(),
+            self.db_agent.get_agent(),
+            self.incident_agent.get_agent(),
+            self.jira_agent.get_agent()
+        ]
+    
+    def _create_crew(self, agents: list, tasks: list) -> Crew:
+        """Create the crew that runs the analysis tasks"""
+        # Sequential process: the async log/db tasks overlap and the
+        # remaining tasks fan in through their context lists. Crew memory stays
+        # off: task context already hands results forward, and retrieved memory
+        # injected into prompts would make every prompt differ between runs,
+        # defeating the provider's prefix cache
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            memory=False,
+            max_rpm=Config.MAX_RPM,  # Throttle to the provider's rate limit, not a fixed delay
+        )
+    
     def _generate_executive_summary(self, result: str, task_id: str) -> str:
         """Generate an executive summary of the analysis"""
         
         summary_lines = [
             f"🎯 EXECUTIVE SUMMARY - Task {task_id}",
-            f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            _SUMMARY_RULE,
         ]
         
         # Extract key findings (simplified pattern matching)
-        result_lower = result.lower()
+        hits = {match.group(0).lower() for match in _SUMMARY_RE.finditer(result)}
         
-        if "failed" in result_lower or "error" in result_lower:
+        if "failed" in hits or "error" in hits:
             summary_lines.append("🚨 STATUS: Critical issue identified requiring immediate attention")
-        elif "warning" in result_lower:
+        elif "warning" in hits:
             summary_lines.append("⚠️  STATUS: Warning conditions detected, monitoring recommended")
         else:
             summary_lines.append("✅ STATUS: Analysis complete, no critical issues found")
         
         # Key findings
-        if "nullpointer" in result_lower:
+        if "nullpointer" in hits:
             summary_lines.append("🔍 KEY FINDING: Null pointer exception detected in code")
-        if "timeout" in result_lower:
+        if "timeout" in hits:
             summary_lines.append("🔍 KEY FINDING: Connection timeout issues identified")
-        if "memory" in result_lower:
+        if "memory" in hits:
             summary_lines.append("🔍 KEY FINDING: Memory-related issues detected")
         
         # Add recommendations
@@ -162,14 +342,6 @@ class OpsAnalysisOrchestrator:
             for rec in recommendations[:3]:  # Top 3 recommendations
                 summary_lines.append(f"   {rec}")
         
-        summary_lines.extend([
-            f"\n📊 ANALYSIS SCOPE:",
-            f"   • Log files analyzed for error patterns",
-            f"   • Code base reviewed for potential bugs", 
-            f"   • Performance metrics evaluated",
-            f"   • Historical incidents researched",
-            f"   • JIRA ticket prepared for tracking",
-            f"\n🎫 NEXT STEPS: Review generated JIRA ticket for detailed action items"
-        ])
+        summary_lines.append(_SUMMARY_SCOPE)
         
         return "\n".join(summary_lines)
@@ -1,5 +1,6 @@
 
 import os
+import re
 
 class Config:
     """Configuration class containing all system settings"""
@@ -9,6 +10,17 @@ class Config:
     LLM_MODEL = "gpt-4o-mini"
     LLM_TEMPERATURE = 0.1
     
+    # Per-agent model tiering: template-bound extraction runs on a small model,
+    # ticket synthesis on a larger one. Agents not listed use LLM_MODEL.
+    MODEL_PER_AGENT = {
+        "log": "gpt-4.1-nano",
+        "code": "gpt-4o-mini",
+        "db": "gpt-4.1-nano",
+        "incident": "gpt-4o-mini",
+        "jira": "gpt-4o",
+    }
+    MAX_RPM = 60  # Requests per minute allowed by the LLM account
+    
     # Data Paths
     LOG_DIR = "data/logs"
     CODEBASE_DIR = "data/codebase" 
@@ -19,6 +31,7 @@ class Config:
     MAX_LOG_LINES = 100
     MAX_CODE_PREVIEW_CHARS = 800
     MAX_INCIDENT_RESULTS = 5
+    MAX_FINDING_BRIEF_CHARS = 600
     
     # JIRA Configuration
     JIRA_PROJECT_KEY = "OPS"
@@ -29,12 +42,22 @@ class Config:
     PERFORMANCE_KEYWORDS = ['slow', 'latency', 'performance', 'timeout']
     ERROR_QUERY_KEYWORDS = ['fail', 'error', 'exception', 'crash']
     
+    # Substring matchers over each keyword list ("slow" also matches "slowly")
+    PERFORMANCE_RE = re.compile("|".join(map(re.escape, PERFORMANCE_KEYWORDS)), re.IGNORECASE)
+    ERROR_QUERY_RE = re.compile("|".join(map(re.escape, ERROR_QUERY_KEYWORDS)), re.IGNORECASE)
+    
     # File Extensions for Code Analysis
     CODE_EXTENSIONS = [".py", ".java", ".js", ".go", ".cpp", ".c", ".rb", ".php"]
     
+    # Set once validate_config has succeeded
+    _validated = False
+    
     @classmethod
     def validate_config(cls):
         """Validate that all required configuration is present"""
+        if cls._validated:
+            return True
+        
         if not cls.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
@@ -42,4 +65,5 @@ class Config:
         for directory in [cls.LOG_DIR, cls.CODEBASE_DIR, os.path.dirname(cls.METRICS_DB)]:
             os.makedirs(directory, exist_ok=True)
         
+        cls._validated = True
         return True
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 from agents.orchestrator_agent import OpsAnalysisOrchestrator
@@ -7,6 +8,13 @@ from config.config import Config
 # Load environment variables
 load_dotenv()
 
+def _run_concurrently(*creators):
+    """Run independent sample-data creators in parallel; re-raises the first error"""
+    with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+        futures = [executor.submit(creator) for creator in creators]
+        for future in futures:
+            future.result()
+
 def setup_sample_data():
     """Create sample data files for testing"""
     from tools.log_tools import create_sample_logs
@@ -18,11 +26,13 @@ def setup_sample_data():
     os.makedirs("data/logs", exist_ok=True)
     os.makedirs("data/codebase", exist_ok=True)
     
-    # Create sample data files
-    create_sample_logs()
-    create_sample_code()
-    create_sample_database()
-    create_sample_incidents()
+    # Create sample data files; each writes its own files, so they run in parallel
+    _run_concurrently(
+        create_sample_logs,
+        create_sample_code,
+        create_sample_database,
+        create_sample_incidents,
+    )
     
     print("✅ Sample data created successfully!")
 
@@ -33,11 +43,13 @@ def create_extended_sample_data():
     from tools.db_tools import create_extended_metrics
     from tools.incident_tools import create_more_incidents
     
-    create_performance_logs()
-    create_security_logs()
-    create_additional_code_samples()
-    create_extended_metrics()
-    create_more_incidents()
+    _run_concurrently(
+        create_performance_logs,
+        create_security_logs,
+        create_additional_code_samples,
+        create_extended_metrics,
+        create_more_incidents,
+    )
     
     print("✅ Extended sample data created!")
 
@@ -65,20 +77,19 @@ def test_different_scenarios():
     
     orchestrator = OpsAnalysisOrchestrator()
     
-    for i, scenario in enumerate(test_scenarios, 1):
+    # All scenarios go through one batched crew run: each agent answers every
+    # scenario in a single prompt instead of one round-trip per scenario
+    results = orchestrator.execute_analysis_batch([scenario['query'] for scenario in test_scenarios])
+    
+    for i, (scenario, result) in enumerate(zip(test_scenarios, results), 1):
         print(f"\n{'='*60}")
         print(f"TEST SCENARIO {i}: {scenario['description']}")
         print(f"{'='*60}")
         
-        try:
-            result = orchestrator.execute_analysis(scenario['query'])
+        if result.startswith("❌"):
+            print(f"❌ Scenario {i} failed: {result}")
+        else:
             print(f"✅ Scenario {i} completed successfully")
-        except Exception as e:
-            print(f"❌ Scenario {i} failed: {e}")
-        
-        # Add delay between tests
-        import time
-        time.sleep(2)
 
 def main():
     """Main execution function"""
@@ -3,12 +3,34 @@
 # ==============================================================================
 
 import os
+import atexit
+import collections
+import contextlib
+import csv
+import functools
+import hashlib
+import inspect
+import io
+import logging
+import logging.handlers
+import mmap
+import queue
+import shelve
+import sys
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
 from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, ChatResult
+import httpx
 import sqlite3
 import pandas as pd
+import numpy as np
 import re
 from typing import Dict, List, Any
 from datetime import datetime
@@ -16,17 +38,105 @@ from datetime import datetime
 # Load environment variables
 load_dotenv()
 
-# Initialize LLM
-llm = ChatOpenAI(
-    model="gpt-3.5-turbo",
-    temperature=0.1,
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+logger = logging.getLogger(__name__)
+
+# Task IDs as queries and prompts spell them: TID-123, TID_123 or TID123
+_TID_RE = re.compile(r"TID[-_]?\d+")
+
+def _configure_logging():
+    """Send log records through a queue so formatting and stdout writes happen on a background thread"""
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener.start()
+    atexit.register(listener.stop)
+
+class CrewLoggingAdapter:
+    """Crew step and task callbacks that log progress instead of printing it"""
+    
+    def __init__(self, log: logging.Logger):
+        self.log = log
+    
+    def step(self, step_output):
+        self.log.info("Agent step: %s", step_output)
+    
+    def task(self, task_output):
+        self.log.info("Task finished by %s: %s",
+                      getattr(task_output, "agent", "agent"),
+                      getattr(task_output, "summary", task_output))
+
+_crew_logging = CrewLoggingAdapter(logger)
+
+# LLM client, created on first use so importing this module has no side effects
+@functools.lru_cache(maxsize=None)
+def _get_llm():
+    return ChatOpenAI(
+        model="gpt-3.5-turbo",
+        temperature=0.1,
+        api_key=os.getenv("OPENAI_API_KEY")
+    )
 
 # ==============================================================================
 # CUSTOM TOOLS
 # ==============================================================================
 
+LOG_ERROR_KEYWORDS = ("exception", "traceback", "fail", "error", "timeout", "null")
+_LOG_ERROR_RE = re.compile(
+    b"|".join(re.escape(keyword.encode()) for keyword in LOG_ERROR_KEYWORDS), re.IGNORECASE
+)
+
+# Scans of fewer files or bytes than this stay on threads; forking workers costs more
+LOG_PROCESS_POOL_MIN_FILES = 4
+LOG_PROCESS_POOL_MIN_BYTES = 64 * 1024 * 1024
+# Newlines are located this many bytes at a time to bound the comparison buffer
+LOG_NEWLINE_BLOCK_BYTES = 16 * 1024 * 1024
+
+def _newline_offsets(buf):
+    """Sorted offsets of every newline in buf, found by numpy a block at a time"""
+    view = np.frombuffer(buf, dtype=np.uint8)
+    return np.concatenate([
+        np.flatnonzero(view[start:start + LOG_NEWLINE_BLOCK_BYTES] == 0x0A) + start
+        for start in range(0, len(view), LOG_NEWLINE_BLOCK_BYTES)
+    ])
+
+def _scan_one_log(args):
+    """Scan one log file; returns (filename, line_num, line, is_critical) per hit"""
+    path, task_id = args
+    filename = os.path.basename(path)
+    hits = []
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return hits
+            # Map the file instead of reading it; only hit lines get copied out
+            buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except Exception:
+        return hits
+    
+    with buf:
+        # A keyword in the file name or the task ID marks every hit critical
+        always_critical = _LOG_ERROR_RE.search(f"{filename}:{task_id}".encode()) is not None
+        
+        task_id_b = task_id.encode()
+        newlines = None
+        hit = buf.find(task_id_b)
+        while hit != -1:
+            if newlines is None:
+                newlines = _newline_offsets(buf)
+            # Newlines before the hit give its line number, and bracket its line
+            line_index = int(np.searchsorted(newlines, hit))
+            line_start = int(newlines[line_index - 1]) + 1 if line_index else 0
+            line_end = int(newlines[line_index]) if line_index < len(newlines) else len(buf)
+            
+            # The error regex runs on the hit line in place, without a lowercased copy
+            is_critical = always_critical or _LOG_ERROR_RE.search(buf, line_start, line_end) is not None
+            line = buf[line_start:line_end].decode(errors="replace").strip()
+            hits.append((filename, line_index + 1, line, is_critical))
+            hit = buf.find(task_id_b, line_end + 1)
+    return hits
+
 class LogAnalysisTool(BaseTool):
     name: str = "log_analysis_tool"
     description: str = "Analyzes log files for errors and issues related to a specific task ID"
@@ -39,33 +149,69 @@ class LogAnalysisTool(BaseTool):
         if not os.path.exists(log_dir):
             return f"Log directory not found: {log_dir}"
         
-        for filename in os.listdir(log_dir):
-            if filename.endswith(".log"):
-                try:
-                    with open(os.path.join(log_dir, filename), "r") as file:
-                        for line_num, line in enumerate(file, 1):
-                            if task_id in line:
-                                matching_lines.append(f"{filename}:{line_num}: {line.strip()}")
-                except Exception as e:
-                    continue
-        
-        if not matching_lines:
+        # scandir hands back the path and file type with each entry, so no extra lookups
+        paths = []
+        total_bytes = 0
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".log") and entry.is_file():
+                    paths.append(entry.path)
+                    total_bytes += entry.stat().st_size
+        if not paths:
             return f"No log entries found for task {task_id}"
         
+        # Files are independent, so scan them in parallel; map() keeps directory order
+        if len(paths) >= LOG_PROCESS_POOL_MIN_FILES and total_bytes >= LOG_PROCESS_POOL_MIN_BYTES:
+            executor = ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1))
+        else:
+            # Threads only wait on reads; capped like the default ThreadPoolExecutor size
+            executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(paths)))
+        with executor:
+            results = list(executor.map(_scan_one_log, [(path, task_id) for path in paths]))
+        
         # Classify errors
-        error_keywords = ["exception", "traceback", "fail", "error", "timeout", "null"]
-        critical_issues = []
+        for hits in results:
+            for filename, line_num, line, is_critical in hits:
+                if is_critical:
+                    matching_lines.append(f"🔴 CRITICAL: {filename}:{line_num}: {line}")
+                else:
+                    matching_lines.append(f"ℹ️  INFO: {filename}:{line_num}: {line}")
         
-        for line in matching_lines:
-            line_lower = line.lower()
-            for keyword in error_keywords:
-                if keyword in line_lower:
-                    critical_issues.append(f"🔴 CRITICAL: {line}")
-                    break
-            else:
-                critical_issues.append(f"ℹ️  INFO: {line}")
+        if not matching_lines:
+            return f"No log entries found for task {task_id}"
         
-        return "\n".join(critical_issues)
+        return "\n".join(matching_lines)
+
+@functools.lru_cache(maxsize=128)
+def _code_pattern(task_id, error_terms):
+    # The task ID must match exactly, the error terms in any case; one search covers all
+    terms = "|".join(re.escape(term) for term in error_terms)
+    if not terms:
+        return re.compile(re.escape(task_id))
+    return re.compile(f"{re.escape(task_id)}|(?i:{terms})")
+
+CODE_EXTENSIONS = frozenset({".py", ".java", ".js", ".go"})
+CODE_SCAN_CHUNK_CHARS = 64 * 1024
+CODE_PREVIEW_CHARS = 800
+
+def _match_code_file(path, pattern, overlap):
+    """Stream a code file through pattern; returns (preview, line count) on a hit, else None"""
+    matched = False
+    newlines = 0
+    window = ""
+    with open(path, "r") as f:
+        preview = f.read(CODE_PREVIEW_CHARS)
+        chunk = preview + f.read(CODE_SCAN_CHUNK_CHARS)
+        while True:
+            if not matched:
+                # Keep the previous chunk's tail so matches across the boundary are found
+                window = (window[-overlap:] if overlap else "") + chunk
+                matched = pattern.search(window) is not None
+            newlines += chunk.count("\n")
+            chunk = f.read(CODE_SCAN_CHUNK_CHARS)
+            if not chunk:
+                break
+    return (preview, newlines + 1) if matched else None
 
 class CodeAnalysisTool(BaseTool):
     name: str = "code_analysis_tool"
@@ -79,20 +225,24 @@ class CodeAnalysisTool(BaseTool):
         
         relevant_files = []
         error_terms = error_context.lower().split() if error_context else []
+        pattern = _code_pattern(task_id, tuple(error_terms))
+        # A match can straddle two chunks by at most the longest search term
+        overlap = max(len(term) for term in [task_id, *error_terms]) - 1
         
-        for filename in os.listdir(codebase_dir):
-            if filename.endswith((".py", ".java", ".js", ".go")):
-                try:
-                    with open(os.path.join(codebase_dir, filename), "r") as f:
-                        content = f.read()
-                        if task_id in content or any(term in content.lower() for term in error_terms):
-                            relevant_files.append({
-                                "filename": filename,
-                                "content": content[:800],  # First 800 chars
-                                "lines": len(content.split('\n'))
-                            })
-                except Exception:
-                    continue
+        with os.scandir(codebase_dir) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1] in CODE_EXTENSIONS and entry.is_file():
+                    try:
+                        match = _match_code_file(entry.path, pattern, overlap)
+                    except Exception:
+                        continue
+                    if match:
+                        preview, lines = match
+                        relevant_files.append({
+                            "filename": entry.name,
+                            "content": preview,
+                            "lines": lines
+                        })
         
         if not relevant_files:
             return "No relevant code files found"
@@ -104,6 +254,27 @@ class CodeAnalysisTool(BaseTool):
         
         return "\n".join(analysis)
 
+_METRICS_QUERY = """
+    SELECT task_id, start_time, end_time, duration_seconds, 
+           status, cpu_usage, memory_usage, error_count
+    FROM task_metrics 
+    WHERE task_id = ?
+"""
+_metrics_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _get_metrics_connection(db_path, inode):
+    # One read-only connection per database file (the inode catches a recreated
+    # file); sqlite3 keeps the SELECT prepared in its statement cache across calls.
+    # Pages are read through a memory map rather than copied into the page cache.
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-32768")
+    conn.execute("PRAGMA busy_timeout=5000")
+    atexit.register(conn.close)
+    return conn
+
 class DatabaseMetricsTool(BaseTool):
     name: str = "database_metrics_tool"
     description: str = "Queries database for task performance metrics and timing data"
@@ -115,18 +286,9 @@ class DatabaseMetricsTool(BaseTool):
             return f"Database not found: {db_path}"
         
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT task_id, start_time, end_time, duration_seconds, 
-                       status, cpu_usage, memory_usage, error_count
-                FROM task_metrics 
-                WHERE task_id = ?
-            """, (task_id,))
-            
-            row = cursor.fetchone()
-            conn.close()
+            conn = _get_metrics_connection(db_path, os.stat(db_path).st_ino)
+            with _metrics_lock:
+                row = conn.execute(_METRICS_QUERY, (task_id,)).fetchone()
             
             if not row:
                 return f"No metrics found for task {task_id}"
@@ -144,6 +306,44 @@ class DatabaseMetricsTool(BaseTool):
         except Exception as e:
             return f"Database query failed: {str(e)}"
 
+_INCIDENT_TOKEN_RE = re.compile(r"\w+")
+
+@functools.lru_cache(maxsize=1)
+def _load_incidents(path, mtime):
+    # mtime is part of the cache key so an edited CSV is reloaded; descriptions
+    # are lowercased and indexed by word once here instead of on every search
+    df = pd.read_csv(path)
+    descriptions = df['description'].str.lower().tolist()
+    index = collections.defaultdict(set)
+    for row, text in enumerate(descriptions):
+        if isinstance(text, str):
+            for token in _INCIDENT_TOKEN_RE.findall(text):
+                index[token].add(row)
+    return df, descriptions, dict(index)
+
+def _incident_rows(descriptions, index, term):
+    """Positions of the rows whose lowercased description contains term"""
+    tokens = _INCIDENT_TOKEN_RE.findall(term)
+    if not tokens:
+        candidates = range(len(descriptions))
+    else:
+        # Inner words of the term must be whole words in the description; the
+        # outer ones may be cut off, so they match by suffix/prefix (or substring)
+        def postings(matches):
+            return set().union(*(rows for token, rows in index.items() if matches(token)))
+        
+        first, last = tokens[0], tokens[-1]
+        if len(tokens) == 1:
+            candidates = postings(lambda token: first in token)
+        else:
+            candidates = postings(lambda token: token.endswith(first)) & postings(lambda token: token.startswith(last))
+            for token in tokens[1:-1]:
+                candidates &= index.get(token, set())
+    
+    # Confirm the whole term on the few candidates that are left
+    return [row for row in sorted(candidates)
+            if isinstance(descriptions[row], str) and term in descriptions[row]]
+
 class IncidentHistoryTool(BaseTool):
     name: str = "incident_history_tool"
     description: str = "Searches historical incidents for similar issues"
@@ -155,27 +355,28 @@ class IncidentHistoryTool(BaseTool):
             return f"Incidents file not found: {incidents_path}"
         
         try:
-            df = pd.read_csv(incidents_path)
+            df, descriptions, index = _load_incidents(incidents_path, os.path.getmtime(incidents_path))
             
             # First try exact task ID match
-            exact_match = df[df['description'].str.contains(task_id, case=False, na=False)]
+            exact_rows = _incident_rows(descriptions, index, task_id.lower())
             
             # Then try error context match
-            context_match = pd.DataFrame()
+            context_rows = set()
             if error_summary and len(error_summary) > 10:
                 keywords = error_summary.lower().split()[:5]  # Top 5 keywords
                 for keyword in keywords:
                     if len(keyword) > 3:  # Skip short words
-                        matches = df[df['description'].str.contains(keyword, case=False, na=False)]
-                        context_match = pd.concat([context_match, matches]).drop_duplicates()
+                        context_rows.update(_incident_rows(descriptions, index, keyword))
             
-            all_matches = pd.concat([exact_match, context_match]).drop_duplicates()
+            # Task ID matches rank ahead of context-only matches; the row positions
+            # are unique, so only the rows shown are ever pulled out of the frame
+            matched_rows = exact_rows + sorted(context_rows.difference(exact_rows))
             
-            if all_matches.empty:
+            if not matched_rows:
                 return f"No similar incidents found for task {task_id}"
             
-            results = [f"Found {len(all_matches)} similar incidents:"]
-            for _, row in all_matches.head(5).iterrows():  # Limit to top 5
+            results = [f"Found {len(matched_rows)} similar incidents:"]
+            for _, row in df.iloc[matched_rows[:5]].iterrows():  # Limit to top 5
                 results.append(f"\n📅 {row['date']} | Severity: {row['severity']}")
                 results.append(f"📋 {row['description'][:150]}...")
                 if pd.notna(row['resolution']):
@@ -191,7 +392,8 @@ class JiraTicketTool(BaseTool):
     
     def _run(self, task_id: str, summary: str, details: str) -> str:
         """Create JIRA ticket"""
-        ticket_id = f"OPS-{datetime.now().strftime('%Y%m%d')}-{task_id.replace('TID-', '')}"
+        now = datetime.now()
+        ticket_id = f"OPS-{now.strftime('%Y%m%d')}-{task_id.replace('TID-', '')}"
         
         ticket = f"""
 🎫 JIRA TICKET CREATED
@@ -216,7 +418,7 @@ Labels: ops-ai, auto-generated, {task_id.lower()}
 5. Implement fix and monitor
 
 Status: OPEN
-Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Created: {now.strftime('%Y-%m-%d %H:%M:%S')}
 """
         return ticket
 
@@ -224,64 +426,83 @@ Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 # AGENTS DEFINITION
 # ==============================================================================
 
-# Log Analysis Agent
-log_agent = Agent(
-    role="Log Analysis Specialist",
-    goal="Extract and analyze error patterns from system logs to identify root causes of task failures",
-    backstory="""You are an expert in log analysis with years of experience in 
-    identifying patterns in system logs. You can quickly spot errors, exceptions, 
-    and anomalies that indicate system issues.""",
-    tools=[LogAnalysisTool()],
-    llm=llm,
-    verbose=True
-)
-
-# Code Analysis Agent  
-code_agent = Agent(
-    role="Code Analysis Expert",
-    goal="Analyze code snippets and identify potential issues that could cause task failures",
-    backstory="""You are a senior software engineer with expertise in debugging 
-    and code analysis. You can identify problematic code patterns, potential 
-    bugs, and suggest improvements.""",
-    tools=[CodeAnalysisTool()],
-    llm=llm,
-    verbose=True
-)
-
-# Database Metrics Agent
-db_agent = Agent(
-    role="Performance Metrics Analyst",
-    goal="Retrieve and analyze task performance metrics from databases",
-    backstory="""You are a database expert and performance analyst. You understand 
-    how to interpret system metrics, identify performance bottlenecks, and correlate 
-    metrics with system issues.""",
-    tools=[DatabaseMetricsTool()],
-    llm=llm,
-    verbose=True
-)
-
-# Incident History Agent
-incident_agent = Agent(
-    role="Incident Management Specialist", 
-    goal="Search historical incidents to find similar issues and their resolutions",
-    backstory="""You are an incident management expert with deep knowledge of 
-    historical system issues. You can identify patterns and suggest solutions 
-    based on past incidents.""",
-    tools=[IncidentHistoryTool()],
-    llm=llm,
-    verbose=True
-)
+# One instance of each tool, shared by every agent that uses it; the tools keep
+# no per-call state, and their caches and connections live at module level
+@functools.lru_cache(maxsize=None)
+def _get_tools():
+    return {
+        "log": LogAnalysisTool(),
+        "code": CodeAnalysisTool(),
+        "db": DatabaseMetricsTool(),
+        "incident": IncidentHistoryTool(),
+        "jira": JiraTicketTool(),
+    }
 
-# JIRA Agent
-jira_agent = Agent(
-    role="Ticket Management Coordinator",
-    goal="Create comprehensive JIRA tickets with all analysis findings",
-    backstory="""You are a project management expert skilled in creating detailed, 
-    actionable tickets that help development teams resolve issues efficiently.""",
-    tools=[JiraTicketTool()],
-    llm=llm,
-    verbose=True
-)
+# Agents are built on first use as well, all sharing the one LLM client
+@functools.lru_cache(maxsize=None)
+def _get_agents():
+    llm = _get_llm()
+    tools = _get_tools()
+    return {
+        # Log Analysis Agent
+        "log_agent": Agent(
+            role="Log Analysis Specialist",
+            goal="Extract and analyze error patterns from system logs to identify root causes of task failures",
+            backstory="""You are an expert in log analysis with years of experience in 
+            identifying patterns in system logs. You can quickly spot errors, exceptions, 
+            and anomalies that indicate system issues.""",
+            tools=[tools["log"]],
+            llm=llm,
+            verbose=False
+        ),
+        
+        # Code Analysis Agent  
+        "code_agent": Agent(
+            role="Code Analysis Expert",
+            goal="Analyze code snippets and identify potential issues that could cause task failures",
+            backstory="""You are a senior software engineer with expertise in debugging 
+            and code analysis. You can identify problematic code patterns, potential 
+            bugs, and suggest improvements.""",
+            tools=[tools["code"]],
+            llm=llm,
+            verbose=False
+        ),
+        
+        # Database Metrics Agent
+        "db_agent": Agent(
+            role="Performance Metrics Analyst",
+            goal="Retrieve and analyze task performance metrics from databases",
+            backstory="""You are a database expert and performance analyst. You understand 
+            how to interpret system metrics, identify performance bottlenecks, and correlate 
+            metrics with system issues.""",
+            tools=[tools["db"]],
+            llm=llm,
+            verbose=False
+        ),
+        
+        # Incident History Agent
+        "incident_agent": Agent(
+            role="Incident Management Specialist", 
+            goal="Search historical incidents to find similar issues and their resolutions",
+            backstory="""You are an incident management expert with deep knowledge of 
+            historical system issues. You can identify patterns and suggest solutions 
+            based on past incidents.""",
+            tools=[tools["incident"]],
+            llm=llm,
+            verbose=False
+        ),
+        
+        # JIRA Agent
+        "jira_agent": Agent(
+            role="Ticket Management Coordinator",
+            goal="Create comprehensive JIRA tickets with all analysis findings",
+            backstory="""You are a project management expert skilled in creating detailed, 
+            actionable tickets that help development teams resolve issues efficiently.""",
+            tools=[tools["jira"]],
+            llm=llm,
+            verbose=False
+        ),
+    }
 
 # ==============================================================================
 # TASKS DEFINITION
@@ -291,9 +512,11 @@ def create_tasks(user_query: str):
     """Create tasks based on user query"""
     
     # Extract task ID from query
-    task_id_match = re.search(r"TID[-_]?\d+", user_query)
+    task_id_match = _TID_RE.search(user_query)
     task_id = task_id_match.group(0) if task_id_match else "UNKNOWN"
     
+    agents = _get_agents()
+    
     log_task = Task(
         description=f"""
         Analyze system logs for task {task_id} to identify errors, exceptions, 
@@ -306,8 +529,9 @@ def create_tasks(user_query: str):
         Query: {user_query}
         Task ID: {task_id}
         """,
-        agent=log_agent,
-        expected_output="Detailed log analysis with error classification and timeline"
+        agent=agents["log_agent"],
+        expected_output="Detailed log analysis with error classification and timeline",
+        async_execution=True
     )
     
     code_task = Task(
@@ -321,7 +545,7 @@ def create_tasks(user_query: str):
         
         Use the log analysis results to guide your code investigation.
         """,
-        agent=code_agent,
+        agent=agents["code_agent"],
         expected_output="Code analysis with identified issues and recommendations",
         context=[log_task]
     )
@@ -335,8 +559,9 @@ def create_tasks(user_query: str):
         3. Error counts and status
         4. Performance trends and anomalies
         """,
-        agent=db_agent,
-        expected_output="Performance metrics analysis with key findings"
+        agent=agents["db_agent"],
+        expected_output="Performance metrics analysis with key findings",
+        async_execution=True
     )
     
     incident_task = Task(
@@ -350,7 +575,7 @@ def create_tasks(user_query: str):
         
         Use insights from log and code analysis to improve search relevance.
         """,
-        agent=incident_agent,
+        agent=agents["incident_agent"],
         expected_output="Historical incident analysis with resolution suggestions",
         context=[log_task, code_task]
     )
@@ -366,33 +591,77 @@ def create_tasks(user_query: str):
         
         Synthesize all previous analysis into an actionable ticket.
         """,
-        agent=jira_agent,
+        agent=agents["jira_agent"],
         expected_output="Complete JIRA ticket with all analysis findings",
         context=[log_task, code_task, db_task, incident_task]
     )
     
-    return [log_task, code_task, db_task, incident_task, jira_task]
+    # log_task and db_task are independent and run concurrently; each later task
+    # waits on them through its context
+    return [log_task, db_task, code_task, incident_task, jira_task]
 
 # ==============================================================================
 # MAIN EXECUTION FUNCTION
 # ==============================================================================
 
-def run_ops_analysis(user_query: str):
-    """Run the complete operational analysis"""
+ANALYSIS_CACHE_PATH = "data/.analysis_cache"
+# Past this many entries the cache file is recreated empty, which also compacts it
+ANALYSIS_CACHE_MAX_ENTRIES = 256
+
+@functools.lru_cache(maxsize=1)
+def _pipeline_signature():
+    """Hash of this module's source (prompts, agents, tools) and the model settings,
+    so an analysis cached by different code or a different model is never reused"""
+    digest = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16)
+    digest.update(f"{Config.LLM_MODEL}\0{Config.LLM_TEMPERATURE}".encode())
+    return digest.hexdigest()
+
+def _data_fingerprint():
+    """Hash of the stamps of every input file the tools read; any edit changes it"""
+    stamps = []
+    for directory in ("data/logs", "data/codebase"):
+        if os.path.isdir(directory):
+            for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+                if entry.is_file():
+                    stat = entry.stat()
+                    stamps.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    # WAL writes land in the -wal file and may leave the database's own mtime alone
+    for path in ("data/metrics.db", "data/metrics.db-wal", "data/incidents.csv"):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return hashlib.blake2b(repr(stamps).encode(), digest_size=16).hexdigest()
+
+def run_ops_analysis(user_query: str) -> str:
+    """Run the complete operational analysis and return its final output text"""
     print(f"\n🤖 Multi-Agent Ops AI System")
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print(f"📥 Query: {user_query}")
     print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # The same query over unchanged data gives the same analysis, so reuse it
+    os.makedirs(os.path.dirname(ANALYSIS_CACHE_PATH), exist_ok=True)
+    cache_prefix = f"{_pipeline_signature()}\0{_data_fingerprint()}\0"
+    cache_key = cache_prefix + user_query
+    with shelve.open(ANALYSIS_CACHE_PATH) as cache:
+        cached = cache.get(cache_key)
+    if cached is not None:
+        print(f"\n♻️  Inputs unchanged since the last run, reusing its analysis")
+        print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        print(cached)
+        return cached
+    
     # Create tasks
     tasks = create_tasks(user_query)
     
     # Create crew
     crew = Crew(
-        agents=[log_agent, code_agent, db_agent, incident_agent, jira_agent],
+        agents=list(_get_agents().values()),
         tasks=tasks,
         process=Process.sequential,
-        verbose=True
+        verbose=False,
+        step_callback=_crew_logging.step,
+        task_callback=_crew_logging.task
     )
     
     # Execute analysis
@@ -403,27 +672,53 @@ def run_ops_analysis(user_query: str):
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print(result)
     
+    # Hits return the stored text, so a fresh run returns text as well
+    result = str(result)
+    cache = shelve.open(ANALYSIS_CACHE_PATH)
+    # Entries for older code or data can never be hit again
+    for key in [key for key in cache if not key.startswith(cache_prefix)]:
+        del cache[key]
+    if len(cache) >= ANALYSIS_CACHE_MAX_ENTRIES:
+        cache.close()
+        cache = shelve.open(ANALYSIS_CACHE_PATH, "n")
+    with cache:
+        cache[cache_key] = result
+    
     return result
 
 # ==============================================================================
 # SAMPLE DATA CREATION FUNCTIONS
 # ==============================================================================
 
-def setup_sample_data():
-    """Create sample data files for testing"""
+def setup_sample_data(force: bool = False):
+    """Create sample data files for testing
+    
+    With force, every file is regenerated, even ones left by an earlier run.
+    """
     
     # Create directories
     os.makedirs("data/logs", exist_ok=True)
     os.makedirs("data/codebase", exist_ok=True)
     
-    # Create sample log files
-    create_sample_logs()
-    create_sample_code()
-    create_sample_database()
-    create_sample_incidents()
+    if force:
+        # Metric rows are upserted, so rows an older generator wrote would survive
+        for path in ("data/metrics.db", "data/metrics.db-wal", "data/metrics.db-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    # Create sample data files; files left by an earlier run are kept as they are
+    _create_missing(["data/logs/application.log", "data/logs/system.log"], create_sample_logs, force)
+    _create_missing(["data/codebase/data_processor.py", "data/codebase/TaskManager.java"], create_sample_code, force)
+    _create_missing(["data/metrics.db"], create_sample_database, force)
+    _create_missing(["data/incidents.csv"], create_sample_incidents, force)
     
     print("✅ Sample data created successfully!")
 
+def _create_missing(targets, creator, force: bool = False):
+    """Run a sample-data creator only if one of the files it writes is missing, or always with force"""
+    if force or not all(os.path.exists(target) for target in targets):
+        creator()
+
 def create_sample_logs():
     """Create sample log files"""
     log1_content = """2024-07-20 10:15:23 INFO [TaskProcessor] Starting task TID-12345
@@ -538,11 +833,27 @@ public class TaskManager {
     with open("data/codebase/TaskManager.java", "w") as f:
         f.write(java_code)
 
+_METRIC_INSERT_SQL = """
+    INSERT OR REPLACE INTO task_metrics 
+    (task_id, start_time, end_time, duration_seconds, status, cpu_usage, memory_usage, error_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+METRIC_INSERT_BATCH_ROWS = 1000
+
+def _insert_metrics(conn, rows):
+    """Insert or replace metric rows in one write transaction; the caller's `with conn` commits it"""
+    conn.execute("BEGIN IMMEDIATE")
+    # Bounded executemany batches keep memory flat for large row sets
+    for start in range(0, len(rows), METRIC_INSERT_BATCH_ROWS):
+        conn.executemany(_METRIC_INSERT_SQL, rows[start:start + METRIC_INSERT_BATCH_ROWS])
+
 def create_sample_database():
     """Create sample SQLite database with metrics"""
     
     conn = sqlite3.connect("data/metrics.db")
     cursor = conn.cursor()
+    # Throwaway sample data: skip fsyncs and keep temp structures in memory
+    cursor.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY;")
     
     # Create table
     cursor.execute("""
@@ -555,10 +866,10 @@ def create_sample_database():
             cpu_usage REAL,
             memory_usage INTEGER,
             error_count INTEGER
-        )
+        ) WITHOUT ROWID
     """)
     
-    # Insert sample data
+    # Insert sample data in one write transaction
     sample_data = [
         ("TID-12345", "2024-07-20 10:15:23", "2024-07-20 10:15:29", 6, "FAILED", 75.5, 850, 3),
         ("TID-12346", "2024-07-20 10:15:30", "2024-07-20 10:16:45", 75, "SUCCESS", 45.2, 420, 0),
@@ -566,13 +877,10 @@ def create_sample_database():
         ("TID-12347", "2024-07-20 11:00:00", "2024-07-20 11:00:05", 5, "FAILED", 82.3, 920, 2)
     ]
     
-    cursor.executemany("""
-        INSERT OR REPLACE INTO task_metrics 
-        (task_id, start_time, end_time, duration_seconds, status, cpu_usage, memory_usage, error_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, sample_data)
-    
-    conn.commit()
+    with conn:
+        _insert_metrics(conn, sample_data)
+        # Refresh planner statistics for the freshly loaded table
+        cursor.execute("ANALYZE")
     conn.close()
 
 def create_sample_incidents():
@@ -628,6 +936,11 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     LLM_MODEL = "gpt-3.5-turbo"
     LLM_TEMPERATURE = 0.1
+    LLM_CACHE_SIZE = 10_000  # Completions kept by the crew's response cache
+    LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+    LLM_MAX_CONNECTIONS = 40
+    LLM_TIMEOUT_SECONDS = 60.0
+    LLM_CONNECT_TIMEOUT_SECONDS = 5.0
     
     # Data Paths
     LOG_DIR = "data/logs"
@@ -648,25 +961,44 @@ class Config:
 # ADVANCED ANALYSIS UTILITIES  
 # ==============================================================================
 
+_ERROR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Exception in thread.*',
+        r'.*Exception:.*',
+        r'Error:.*',
+        r'FATAL:.*',
+        r'.*timeout.*',
+        r'.*connection.*failed.*'
+    )
+]
+# Every pattern above stays within one line, so a line can only match if it
+# contains one of these anchors; a single scan finds those lines
+_ERROR_LINE_RE = re.compile(
+    r'exception in thread|exception:|error:|fatal:|timeout|connection.*failed', re.IGNORECASE
+)
+_RECOMMENDATION_SIGNALS_RE = re.compile(r'nullpointer|timeout|memory|database', re.IGNORECASE)
+
 class AnalysisUtils:
     @staticmethod
     def extract_error_patterns(text: str) -> List[str]:
         """Extract common error patterns from text"""
-        patterns = [
-            r'Exception in thread.*',
-            r'.*Exception:.*',
-            r'Error:.*',
-            r'FATAL:.*',
-            r'.*timeout.*',
-            r'.*connection.*failed.*'
-        ]
-        
-        found_patterns = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            found_patterns.extend(matches)
+        found_patterns = set()
+        hit = _ERROR_LINE_RE.search(text)
+        while hit:
+            line_start = text.rfind("\n", 0, hit.start()) + 1
+            line_end = text.find("\n", hit.end())
+            if line_end == -1:
+                line_end = len(text)
+            
+            # Each pattern matches at most once per line, running to its end
+            line = text[line_start:line_end]
+            for pattern in _ERROR_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    found_patterns.add(match.group())
+            hit = _ERROR_LINE_RE.search(text, line_end)
         
-        return list(set(found_patterns))
+        return list(found_patterns)
     
     @staticmethod
     def calculate_severity(error_count: int, duration: int, cpu_usage: float) -> str:
@@ -681,21 +1013,23 @@ class AnalysisUtils:
             return "LOW"
     
     @staticmethod
-    def generate_recommendations(analysis_results: Dict) -> List[str]:
+    def generate_recommendations(analysis_results: Any) -> List[str]:
         """Generate actionable recommendations based on analysis"""
         recommendations = []
+        # Stringify the results once and find every signal in one case-insensitive scan
+        hits = {hit.lower() for hit in _RECOMMENDATION_SIGNALS_RE.findall(str(analysis_results))}
         
-        if "nullpointer" in str(analysis_results).lower():
+        if "nullpointer" in hits:
             recommendations.append("🔧 Add null checks and defensive programming practices")
             
-        if "timeout" in str(analysis_results).lower():
+        if "timeout" in hits:
             recommendations.append("⏱️ Review and increase timeout configurations")
             recommendations.append("🔄 Implement retry mechanisms with exponential backoff")
             
-        if "memory" in str(analysis_results).lower():
+        if "memory" in hits:
             recommendations.append("🧠 Investigate memory leaks and optimize memory usage")
             
-        if "database" in str(analysis_results).lower():
+        if "database" in hits:
             recommendations.append("🗄️ Review database connection pool settings")
             recommendations.append("📊 Add database performance monitoring")
             
@@ -705,90 +1039,110 @@ class AnalysisUtils:
 # ENHANCED CREW WITH CALLBACKS
 # ==============================================================================
 
-class OpsAnalysisCrew:
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model=Config.LLM_MODEL,
-            temperature=Config.LLM_TEMPERATURE,
-            api_key=Config.OPENAI_API_KEY
-        )
-        self.agents = self._create_agents()
-        self.analysis_results = {}
-    
-    def _create_agents(self):
-        """Create all agents with enhanced configurations"""
-        return {
-            'log_agent': Agent(
-                role="Senior Log Analysis Specialist",
-                goal="Perform deep analysis of system logs to identify root causes and error patterns",
-                backstory="""You are a veteran system administrator with 15+ years of experience 
-                in log analysis. You can quickly identify critical errors, trace error propagation, 
-                and understand system behavior patterns from log data.""",
-                tools=[LogAnalysisTool()],
-                llm=self.llm,
-                verbose=True,
-                allow_delegation=False
-            ),
-            'code_agent': Agent(
-                role="Senior Code Analysis Expert", 
-                goal="Analyze code for bugs, security issues, and performance problems",
-                backstory="""You are a principal software engineer with expertise in multiple 
-                programming languages. You excel at static code analysis, identifying anti-patterns, 
-                and suggesting architectural improvements.""",
-                tools=[CodeAnalysisTool()],
-                llm=self.llm,
-                verbose=True,
-                allow_delegation=False
-            ),
-            'db_agent': Agent(
-                role="Database Performance Specialist",
-                goal="Analyze database metrics and identify performance bottlenecks", 
-                backstory="""You are a database expert with deep knowledge of query optimization, 
-                index tuning, and database performance monitoring. You can correlate metrics 
-                with application performance issues.""",
-                tools=[DatabaseMetricsTool()],
-                llm=self.llm,
-                verbose=True,
-                allow_delegation=False
-            ),
-            'incident_agent': Agent(
-                role="Incident Management Expert",
-                goal="Research historical incidents and provide resolution strategies",
-                backstory="""You are a senior SRE with extensive experience in incident response 
-                and post-mortem analysis. You excel at finding patterns in historical data 
-                and predicting potential issues.""",
-                tools=[IncidentHistoryTool()],
-                llm=self.llm,
-                verbose=True,
-                allow_delegation=False
-            ),
-            'jira_agent': Agent(
-                role="Technical Project Manager",
-                goal="Create comprehensive tickets with actionable next steps",
-                backstory="""You are an experienced technical project manager who excels at 
-                synthesizing complex technical information into clear, actionable tickets 
-                that development teams can execute efficiently.""",
-                tools=[JiraTicketTool()],
-                llm=self.llm,
-                verbose=True,
-                allow_delegation=False
-            )
-        }
+class _CompletionCache:
+    """Thread-safe LRU of chat completions with hit/miss counters"""
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return result
     
-    def create_enhanced_tasks(self, user_query: str):
-        """Create enhanced tasks with better context and dependencies"""
+    def put(self, key: str, result) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+_completion_cache = _CompletionCache(Config.LLM_CACHE_SIZE)
+
+# Prompts that differ only in their task ID share one cache entry, with the ID
+# swapped for a placeholder in both the key and the stored response
+_CACHE_TID_PLACEHOLDER = "<TID>"
+
+def _prompt_task_id(contents):
+    """The single task ID the prompt mentions, or None when templating it would be unsafe"""
+    if not all(isinstance(content, str) and _CACHE_TID_PLACEHOLDER not in content for content in contents):
+        return None
+    task_ids = {task_id for content in contents for task_id in _TID_RE.findall(content)}
+    return task_ids.pop() if len(task_ids) == 1 else None
+
+def _swap_contents(result, swap):
+    """Copy of a ChatResult with swap applied to every message's text, or None if it has non-text output"""
+    generations = []
+    for generation in result.generations:
+        message = generation.message
+        if not isinstance(message.content, str) or getattr(message, "tool_calls", None):
+            return None
+        content = swap(message.content)
+        if content is None:
+            return None
+        generations.append(ChatGeneration(
+            message=message.model_copy(update={"content": content}),
+            generation_info=generation.generation_info,
+        ))
+    return ChatResult(generations=generations, llm_output=result.llm_output)
+
+class CachedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that answers a prompt it has already seen from the shared cache"""
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        contents = [message.content for message in messages]
+        task_id = _prompt_task_id(contents)
+        if task_id is not None:
+            contents = [_TID_RE.sub(_CACHE_TID_PLACEHOLDER, content).lower() for content in contents]
         
-        # Extract task ID and classify query type
-        task_id_match = re.search(r"TID[-_]?\d+", user_query)
-        task_id = task_id_match.group(0) if task_id_match else "UNKNOWN"
+        # The agent's role and task text are in the messages, so they key the entry too
+        payload = repr((
+            self.model_name,
+            self.temperature,
+            [(message.type, content) for message, content in zip(messages, contents)],
+            stop,
+            sorted(kwargs.items()),
+        ))
+        key = hashlib.sha256(payload.encode()).hexdigest()
         
-        query_lower = user_query.lower()
-        is_performance_query = any(word in query_lower for word in ['slow', 'latency', 'performance', 'timeout'])
-        is_error_query = any(word in query_lower for word in ['fail', 'error', 'exception', 'crash'])
+        cached = _completion_cache.get(key)
+        if cached is not None:
+            if task_id is None:
+                return cached
+            return _swap_contents(cached, lambda text: text.replace(_CACHE_TID_PLACEHOLDER, task_id))
         
-        # Task 1: Log Analysis
-        log_task = Task(
-            description=f"""
+        result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        if task_id is None:
+            _completion_cache.put(key, result)
+        else:
+            def to_template(text):
+                # Only template responses whose IDs are all the prompt's own; any
+                # other ID could not be substituted back, so the entry is skipped
+                if _CACHE_TID_PLACEHOLDER in text or set(_TID_RE.findall(text)) - {task_id}:
+                    return None
+                return _TID_RE.sub(_CACHE_TID_PLACEHOLDER, text)
+            
+            template = _swap_contents(result, to_template)
+            if template is not None:
+                _completion_cache.put(key, template)
+        return result
+
+# Keywords the executive summary branches on; the lookahead lets matches overlap
+_SUMMARY_KEYWORDS_RE = re.compile(r"(?=(nullpointer|timeout|memory|failed|error|warning))", re.IGNORECASE)
+
+# Task description templates for OpsAnalysisCrew, filled per query with format_map
+_LOG_LOOK_FOR = ', '.join(['exceptions', 'timeouts', 'connection failures', 'null pointer errors'])
+
+_LOG_TASK_TMPL = """
             Perform comprehensive log analysis for task {task_id}:
             
             PRIMARY OBJECTIVES:
@@ -799,8 +1153,8 @@ class OpsAnalysisCrew:
             5. Determine error severity and impact
             
             ANALYSIS FOCUS:
-            - Look for: {', '.join(['exceptions', 'timeouts', 'connection failures', 'null pointer errors'])}
-            - Pay special attention to: {"performance issues" if is_performance_query else "error patterns"}
+            - Look for: {look_for}
+            - Pay special attention to: {focus}
             - Timeline reconstruction from log timestamps
             
             DELIVERABLES:
@@ -811,14 +1165,9 @@ class OpsAnalysisCrew:
             
             User Query: {user_query}
             Task ID: {task_id}
-            """,
-            agent=self.agents['log_agent'],
-            expected_output="Comprehensive log analysis report with error timeline and classification"
-        )
-        
-        # Task 2: Code Analysis
-        code_task = Task(
-            description=f"""
+            """
+
+_CODE_TASK_TMPL = """
             Analyze codebase for issues related to task {task_id} and log findings:
             
             PRIMARY OBJECTIVES:
@@ -842,15 +1191,9 @@ class OpsAnalysisCrew:
             - Specific line numbers and problematic code sections
             - Recommended fixes and improvements
             - Prevention strategies for similar issues
-            """,
-            agent=self.agents['code_agent'],
-            expected_output="Detailed code analysis with identified bugs and recommended fixes",
-            context=[log_task]
-        )
-        
-        # Task 3: Database Metrics Analysis
-        db_task = Task(
-            description=f"""
+            """
+
+_DB_TASK_TMPL = """
             Retrieve and analyze performance metrics for task {task_id}:
             
             PRIMARY OBJECTIVES:
@@ -877,14 +1220,9 @@ class OpsAnalysisCrew:
             - Anomaly detection results
             - Resource utilization analysis
             - Performance impact assessment
-            """,
-            agent=self.agents['db_agent'],
-            expected_output="Performance metrics analysis with anomaly detection and correlation findings"
-        )
-        
-        # Task 4: Incident History Research
-        incident_task = Task(
-            description=f"""
+            """
+
+_INCIDENT_TASK_TMPL = """
             Research historical incidents similar to current {task_id} issue:
             
             PRIMARY OBJECTIVES:
@@ -909,15 +1247,9 @@ class OpsAnalysisCrew:
             - Common root causes for this issue type
             - Preventive measures and monitoring recommendations
             - Escalation patterns and team involvement history
-            """,
-            agent=self.agents['incident_agent'],
-            expected_output="Historical incident analysis with proven resolution strategies and prevention recommendations",
-            context=[log_task, code_task]
-        )
-        
-        # Task 5: Comprehensive JIRA Ticket Creation
-        jira_task = Task(
-            description=f"""
+            """
+
+_JIRA_TASK_TMPL = """
             Create a comprehensive, actionable JIRA ticket for {task_id} issue:
             
             PRIMARY OBJECTIVES:
@@ -951,55 +1283,274 @@ class OpsAnalysisCrew:
             - Priority and severity justification
             - Clear next steps with estimated effort
             - Monitoring and validation criteria
-            """,
+            """
+
+class TokenCollector(BaseCallbackHandler):
+    """Watches each streamed response and logs when it reaches a section marker
+    
+    Markers are reported as soon as their tokens arrive, so progress shows up
+    while the rest of the response is still being generated. Only the last few
+    characters of a response are kept, enough to catch a marker split across tokens.
+    """
+    
+    def __init__(self, markers=("Action:", "Final Answer:")):
+        self.markers = markers
+        self._overlap = max(map(len, markers)) - 1
+        self._buffers = {}  # run_id -> (tail, chars so far, unseen markers)
+        self._lock = threading.Lock()
+    
+    def on_llm_new_token(self, token: str, *, run_id, **kwargs):
+        with self._lock:
+            tail, size, pending = self._buffers.get(run_id) or ("", 0, set(self.markers))
+            # A marker split across tokens is completed by the tail of the earlier ones
+            window = tail + token
+            reached = [marker for marker in pending if marker in window]
+            pending.difference_update(reached)
+            self._buffers[run_id] = (window[-self._overlap:] if pending else "", size + len(token), pending)
+        for marker in reached:
+            logger.info("Response %s reached %r after %d chars",
+                        run_id, marker, size - len(tail) + window.find(marker))
+    
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            self._buffers.pop(run_id, None)
+    
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._buffers.pop(run_id, None)
+
+@functools.lru_cache(maxsize=None)
+def _get_crew_llm():
+    # Every OpsAnalysisCrew shares one client and its HTTP connection pool; the
+    # pool is sized for the parallel tasks so warm connections skip the TLS handshake
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_keepalive_connections=Config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=Config.LLM_MAX_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(Config.LLM_TIMEOUT_SECONDS, connect=Config.LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+    atexit.register(http_client.close)
+    return CachedChatOpenAI(
+        model=Config.LLM_MODEL,
+        temperature=Config.LLM_TEMPERATURE,
+        api_key=Config.OPENAI_API_KEY,
+        http_client=http_client,
+        streaming=True,
+        callbacks=[TokenCollector()]
+    )
+
+class OpsAnalysisCrew:
+    def __init__(self):
+        self.llm = _get_crew_llm()
+        self.agents = self._create_agents()
+        self.analysis_results = {}
+    
+    def _create_agents(self):
+        """Create all agents with enhanced configurations"""
+        tools = _get_tools()
+        return {
+            'log_agent': Agent(
+                role="Senior Log Analysis Specialist",
+                goal="Perform deep analysis of system logs to identify root causes and error patterns",
+                backstory="""You are a veteran system administrator with 15+ years of experience 
+                in log analysis. You can quickly identify critical errors, trace error propagation, 
+                and understand system behavior patterns from log data.""",
+                tools=[tools['log']],
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            ),
+            'code_agent': Agent(
+                role="Senior Code Analysis Expert", 
+                goal="Analyze code for bugs, security issues, and performance problems",
+                backstory="""You are a principal software engineer with expertise in multiple 
+                programming languages. You excel at static code analysis, identifying anti-patterns, 
+                and suggesting architectural improvements.""",
+                tools=[tools['code']],
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            ),
+            'db_agent': Agent(
+                role="Database Performance Specialist",
+                goal="Analyze database metrics and identify performance bottlenecks", 
+                backstory="""You are a database expert with deep knowledge of query optimization, 
+                index tuning, and database performance monitoring. You can correlate metrics 
+                with application performance issues.""",
+                tools=[tools['db']],
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            ),
+            'incident_agent': Agent(
+                role="Incident Management Expert",
+                goal="Research historical incidents and provide resolution strategies",
+                backstory="""You are a senior SRE with extensive experience in incident response 
+                and post-mortem analysis. You excel at finding patterns in historical data 
+                and predicting potential issues.""",
+                tools=[tools['incident']],
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            ),
+            'jira_agent': Agent(
+                role="Technical Project Manager",
+                goal="Create comprehensive tickets with actionable next steps",
+                backstory="""You are an experienced technical project manager who excels at 
+                synthesizing complex technical information into clear, actionable tickets 
+                that development teams can execute efficiently.""",
+                tools=[tools['jira']],
+                llm=self.llm,
+                verbose=False,
+                allow_delegation=False
+            )
+        }
+    
+    # Substring matches, so "slowly" still counts as a performance query
+    _PERFORMANCE_RE = re.compile(r"slow|latency|performance|timeout", re.IGNORECASE)
+    _ERROR_RE = re.compile(r"fail|error|exception|crash", re.IGNORECASE)
+    _SECURITY_RE = re.compile(r"security|breach|unauthori[sz]ed|vulnerab|attack|intrusion", re.IGNORECASE)
+    
+    @classmethod
+    def _extract_task_id(cls, user_query: str) -> str:
+        task_id_match = _TID_RE.search(user_query)
+        return task_id_match.group(0) if task_id_match else "UNKNOWN"
+    
+    def create_enhanced_tasks(self, user_query: str, task_id: str = None, full: bool = False):
+        """Create enhanced tasks with better context and dependencies
+        
+        Pure performance queries only run log, metrics and JIRA tasks, and pure
+        security queries only log, incident and JIRA tasks. Error queries need
+        the code review, so they and any other mix, or full=True, run all five.
+        """
+        
+        # Extract task ID (unless the caller already did) and classify query type
+        if task_id is None:
+            task_id = self._extract_task_id(user_query)
+        
+        is_performance_query = self._PERFORMANCE_RE.search(user_query) is not None
+        is_error_query = self._ERROR_RE.search(user_query) is not None
+        is_security_query = self._SECURITY_RE.search(user_query) is not None
+        run_code = run_db = run_incident = True
+        if not full and not is_error_query and is_performance_query != is_security_query:
+            run_code = False
+            run_db = is_performance_query
+            run_incident = is_security_query
+        
+        # Only these slots vary per query; the rest of each description is a constant
+        fmt = {
+            'task_id': task_id,
+            'user_query': user_query,
+            'look_for': _LOG_LOOK_FOR,
+            'focus': "performance issues" if is_performance_query else "error patterns",
+        }
+        
+        # Task 1: Log Analysis
+        log_task = Task(
+            description=_LOG_TASK_TMPL.format_map(fmt),
+            agent=self.agents['log_agent'],
+            expected_output="Comprehensive log analysis report with error timeline and classification",
+            async_execution=True
+        )
+        
+        # Log and metrics analysis share no inputs, so they run concurrently; the
+        # later tasks wait for them through their context
+        tasks = [log_task]
+        
+        # Task 2: Code Analysis
+        code_task = None
+        if run_code:
+            code_task = Task(
+                description=_CODE_TASK_TMPL.format_map(fmt),
+                agent=self.agents['code_agent'],
+                expected_output="Detailed code analysis with identified bugs and recommended fixes",
+                context=[log_task]
+            )
+        
+        # Task 3: Database Metrics Analysis
+        db_task = None
+        if run_db:
+            db_task = Task(
+                description=_DB_TASK_TMPL.format_map(fmt),
+                agent=self.agents['db_agent'],
+                expected_output="Performance metrics analysis with anomaly detection and correlation findings",
+                async_execution=True
+            )
+            tasks.append(db_task)
+        if code_task is not None:
+            tasks.append(code_task)
+        
+        # Task 4: Incident History Research
+        incident_task = None
+        if run_incident:
+            incident_task = Task(
+                description=_INCIDENT_TASK_TMPL.format_map(fmt),
+                agent=self.agents['incident_agent'],
+                expected_output="Historical incident analysis with proven resolution strategies and prevention recommendations",
+                context=[task for task in (log_task, code_task) if task is not None]
+            )
+            tasks.append(incident_task)
+        
+        # Task 5: Comprehensive JIRA Ticket Creation, fed by whichever tasks were built
+        tasks.append(Task(
+            description=_JIRA_TASK_TMPL.format_map(fmt),
             agent=self.agents['jira_agent'],
             expected_output="Complete, actionable JIRA ticket with comprehensive analysis synthesis and clear resolution steps",
-            context=[log_task, code_task, db_task, incident_task]
-        )
+            context=[task for task in (log_task, code_task, db_task, incident_task) if task is not None]
+        ))
         
-        return [log_task, code_task, db_task, incident_task, jira_task]
+        return tasks
     
-    def execute_analysis(self, user_query: str) -> str:
+    def execute_analysis(self, user_query: str, full: bool = False) -> str:
         """Execute the complete operational analysis with enhanced reporting"""
         
         print(f"\n🤖 Multi-Agent Operational Intelligence System")
         print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         print(f"📥 Query: {user_query}")
+        # Wall-clock time only for the banner; durations come from the monotonic clock
+        started = time.perf_counter()
         print(f"⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Extract task ID for tracking
-        task_id_match = re.search(r"TID[-_]?\d+", user_query)
-        task_id = task_id_match.group(0) if task_id_match else "UNKNOWN"
+        task_id = self._extract_task_id(user_query)
         
         print(f"🎯 Target Task: {task_id}")
         print(f"🔍 Analysis Type: Operational Intelligence")
         
         # Create enhanced tasks
-        tasks = self.create_enhanced_tasks(user_query)
+        tasks = self.create_enhanced_tasks(user_query, task_id, full)
+        agents = list({id(task.agent): task.agent for task in tasks}.values())
         
-        # Create crew with sequential process for better context flow
+        # Sequential process for context flow; async tasks overlap within it
         crew = Crew(
-            agents=list(self.agents.values()),
+            agents=agents,
             tasks=tasks,
             process=Process.sequential,
-            verbose=True,
-            memory=True,  # Enable memory for better context retention
+            verbose=False,
+            step_callback=_crew_logging.step,
+            task_callback=_crew_logging.task,
+            # No crew memory: task context already hands results on, and memory
+            # costs embedding round-trips on every task
+            memory=False,
         )
         
         try:
             print(f"\n🚀 Initiating multi-agent analysis...")
-            print(f"👥 Agents: {len(self.agents)} specialized agents")
-            print(f"📋 Tasks: {len(tasks)} sequential analysis tasks")
+            print(f"👥 Agents: {len(agents)} specialized agents")
+            print(f"📋 Tasks: {len(tasks)} analysis tasks")
             
             # Execute the crew
             result = crew.kickoff()
             
             # Generate final summary
-            summary = self._generate_executive_summary(result, task_id)
+            # Summarise the final output's raw text as is, without copying it
+            summary = self._generate_executive_summary(getattr(result, "raw", result), task_id, agents)
             
             print(f"\n✅ Analysis Complete!")
             print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-            print(f"⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"⏱  Elapsed: {time.perf_counter() - started:.2f}s")
+            print(f"🧠 LLM cache: {_completion_cache.hits} hits, {_completion_cache.misses} misses")
             print(f"\n{summary}")
             
             return result
@@ -1009,48 +1560,53 @@ class OpsAnalysisCrew:
             print(error_msg)
             return error_msg
     
-    def _generate_executive_summary(self, result: str, task_id: str) -> str:
-        """Generate an executive summary of the analysis"""
+    _SCOPE_LINES = (
+        ('log_agent', "   • Log files analyzed for error patterns"),
+        ('code_agent', "   • Code base reviewed for potential bugs"),
+        ('db_agent', "   • Performance metrics evaluated"),
+        ('incident_agent', "   • Historical incidents researched"),
+        ('jira_agent', "   • JIRA ticket prepared for tracking"),
+    )
+    
+    def _generate_executive_summary(self, result: str, task_id: str, agents=None) -> str:
+        """Generate an executive summary of the analysis; the scope lists only the
+        agents that ran (all of them when agents is None)"""
         
         summary_lines = [
             f"🎯 EXECUTIVE SUMMARY - Task {task_id}",
             f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
         ]
         
-        # Extract key findings (simplified pattern matching)
-        result_lower = result.lower()
+        # Extract key findings (simplified pattern matching): one scan, no lowercased copy
+        hits = {hit.lower() for hit in _SUMMARY_KEYWORDS_RE.findall(result)}
         
-        if "failed" in result_lower or "error" in result_lower:
+        if "failed" in hits or "error" in hits:
             summary_lines.append("🚨 STATUS: Critical issue identified requiring immediate attention")
-        elif "warning" in result_lower:
+        elif "warning" in hits:
             summary_lines.append("⚠️  STATUS: Warning conditions detected, monitoring recommended")
         else:
             summary_lines.append("✅ STATUS: Analysis complete, no critical issues found")
         
         # Key findings
-        if "nullpointer" in result_lower:
+        if "nullpointer" in hits:
             summary_lines.append("🔍 KEY FINDING: Null pointer exception detected in code")
-        if "timeout" in result_lower:
+        if "timeout" in hits:
             summary_lines.append("🔍 KEY FINDING: Connection timeout issues identified")
-        if "memory" in result_lower:
+        if "memory" in hits:
             summary_lines.append("🔍 KEY FINDING: Memory-related issues detected")
         
         # Add recommendations
-        recommendations = AnalysisUtils.generate_recommendations({"result": result})
+        # The text itself is scanned; wrapping it in a dict would only add a repr copy
+        recommendations = AnalysisUtils.generate_recommendations(result)
         if recommendations:
             summary_lines.append("\n💡 TOP RECOMMENDATIONS:")
             for rec in recommendations[:3]:  # Top 3 recommendations
                 summary_lines.append(f"   {rec}")
         
-        summary_lines.extend([
-            f"\n📊 ANALYSIS SCOPE:",
-            f"   • Log files analyzed for error patterns",
-            f"   • Code base reviewed for potential bugs", 
-            f"   • Performance metrics evaluated",
-            f"   • Historical incidents researched",
-            f"   • JIRA ticket prepared for tracking",
-            f"\n🎫 NEXT STEPS: Review generated JIRA ticket for detailed action items"
-        ])
+        ran = {id(agent) for agent in (self.agents.values() if agents is None else agents)}
+        summary_lines.append(f"\n📊 ANALYSIS SCOPE:")
+        summary_lines.extend(line for name, line in self._SCOPE_LINES if id(self.agents[name]) in ran)
+        summary_lines.append(f"\n🎫 NEXT STEPS: Review generated JIRA ticket for detailed action items")
         
         return "\n".join(summary_lines)
 
@@ -1058,6 +1614,29 @@ class OpsAnalysisCrew:
 # SAMPLE USAGE AND TESTING
 # ==============================================================================
 
+class _PerThreadStdout(io.TextIOBase):
+    """sys.stdout stand-in that sends a thread's prints to its own buffer while it
+    is capturing, so concurrent runs can each print their output as one block"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (self._stream if buffer is None else buffer).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    @contextlib.contextmanager
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
 def test_different_scenarios():
     """Test the system with different types of operational queries"""
     
@@ -1080,36 +1659,72 @@ def test_different_scenarios():
         }
     ]
     
-    crew_system = OpsAnalysisCrew()
-    
-    for i, scenario in enumerate(test_scenarios, 1):
-        print(f"\n{'='*60}")
-        print(f"TEST SCENARIO {i}: {scenario['description']}")
-        print(f"{'='*60}")
-        
-        try:
-            result = crew_system.execute_analysis(scenario['query'])
-            print(f"✅ Scenario {i} completed successfully")
-        except Exception as e:
-            print(f"❌ Scenario {i} failed: {e}")
-        
-        # Add delay between tests
-        import time
-        time.sleep(2)
+    real_stdout = sys.stdout
+    stdout = _PerThreadStdout(real_stdout)
+    
+    def run_scenario(scenario):
+        # Agents carry per-run executor state, so every scenario gets its own crew
+        with stdout.capture() as output:
+            result = OpsAnalysisCrew().execute_analysis(scenario['query'])
+        return result, output.getvalue()
+    
+    # Scenarios are independent and wait on the LLM API, so run them all at once;
+    # each one's output is buffered and printed whole once it finishes
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(test_scenarios)) as executor:
+            futures = {
+                executor.submit(run_scenario, scenario): (i, scenario)
+                for i, scenario in enumerate(test_scenarios, 1)
+            }
+            for future in as_completed(futures):
+                i, scenario = futures[future]
+                lines = [
+                    f"\n{'='*60}",
+                    f"TEST SCENARIO {i}: {scenario['description']}",
+                    f"{'='*60}",
+                ]
+                try:
+                    result, output = future.result()
+                except Exception as e:
+                    result, output = f"❌ {e}", ""
+                lines.append(output.rstrip("\n"))
+                # execute_analysis reports failures as a "❌ ..." string rather than raising
+                if str(result).startswith("❌"):
+                    lines.append(f"❌ Scenario {i} failed: {result}")
+                else:
+                    lines.append(f"✅ Scenario {i} completed successfully")
+                print("\n".join(lines))
+    finally:
+        sys.stdout = real_stdout
 
 # ==============================================================================
 # ADDITIONAL SAMPLE DATA FILES
 # ==============================================================================
 
-def create_extended_sample_data():
-    """Create additional sample data for more comprehensive testing"""
+def create_extended_sample_data(force: bool = False):
+    """Create additional sample data for more comprehensive testing
+    
+    With force, every file is regenerated, even ones left by an earlier run.
+    """
     
-    # Create more diverse log files
-    create_performance_logs()
-    create_security_logs() 
-    create_additional_code_samples()
-    create_extended_metrics()
-    create_more_incidents()
+    os.makedirs("data/logs", exist_ok=True)
+    os.makedirs("data/codebase", exist_ok=True)
+    
+    # Create more diverse log files; every creator writes its own files, so they run in parallel
+    creators = [
+        functools.partial(_create_missing, ["data/logs/performance.log"], create_performance_logs, force),
+        functools.partial(_create_missing, ["data/logs/security.log"], create_security_logs, force),
+        functools.partial(_create_missing,
+                          ["data/codebase/memory_processor.py", "data/codebase/PerformanceBottleneck.java"],
+                          create_additional_code_samples, force),
+        create_extended_metrics,
+        create_more_incidents,
+    ]
+    with ThreadPoolExecutor(max_workers=len(creators)) as executor:
+        futures = [executor.submit(creator) for creator in creators]
+        for future in futures:
+            future.result()  # Re-raise the first creator error
     
     print("✅ Extended sample data created!")
 
@@ -1124,8 +1739,7 @@ def create_performance_logs():
 2024-07-20 14:30:35 INFO [TaskProcessor] Task TID-12346 terminated due to resource constraints
 """
     
-    with open("data/logs/performance.log", "w") as f:
-        f.write(perf_log)
+    Path("data/logs/performance.log").write_text(perf_log)
 
 def create_security_logs():
     """Create security-focused log files"""
@@ -1136,8 +1750,7 @@ def create_security_logs():
 2024-07-20 16:45:30 INFO [AuditLogger] Security incident logged for task TID-12347
 """
     
-    with open("data/logs/security.log", "w") as f:
-        f.write(security_log)
+    Path("data/logs/security.log").write_text(security_log)
 
 def create_additional_code_samples():
     """Create additional code samples with different types of issues"""
@@ -1178,8 +1791,7 @@ class MemoryLeakProcessor:
         return {f"key_{i}": f"large_data_value_{i}_{task_id}" for i in range(50000)}
 """
     
-    with open("data/codebase/memory_processor.py", "w") as f:
-        f.write(memory_code)
+    Path("data/codebase/memory_processor.py").write_text(memory_code)
     
     # Performance bottleneck code
     perf_code = """// PerformanceBottleneck.java
@@ -1230,13 +1842,14 @@ public class PerformanceBottleneck {
 }
 """
     
-    with open("data/codebase/PerformanceBottleneck.java", "w") as f:
-        f.write(perf_code)
+    Path("data/codebase/PerformanceBottleneck.java").write_text(perf_code)
 
 def create_extended_metrics():
     """Add more metrics data for different scenarios"""
     conn = sqlite3.connect("data/metrics.db")
     cursor = conn.cursor()
+    # Throwaway sample data: skip fsyncs and keep temp structures in memory
+    cursor.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=OFF; PRAGMA temp_store=MEMORY;")
     
     additional_data = [
         ("TID-12348", "2024-07-20 14:30:00", "2024-07-20 14:30:35", 35, "FAILED", 95.8, 1920, 1),
@@ -1245,13 +1858,8 @@ def create_extended_metrics():
         ("TID-12351", "2024-07-20 17:00:00", "2024-07-20 17:00:45", 45, "SUCCESS", 42.1, 385, 0)
     ]
     
-    cursor.executemany("""
-        INSERT OR REPLACE INTO task_metrics 
-        (task_id, start_time, end_time, duration_seconds, status, cpu_usage, memory_usage, error_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, additional_data)
-    
-    conn.commit()
+    with conn:
+        _insert_metrics(conn, additional_data)
     conn.close()
 
 def create_more_incidents():
@@ -1283,24 +1891,86 @@ def create_more_incidents():
         }
     ]
     
-    # Read existing incidents and append new ones
-    existing_df = pd.read_csv("data/incidents.csv")
-    new_df = pd.DataFrame(additional_incidents)
-    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-    combined_df.to_csv("data/incidents.csv", index=False)
+    # Append only the incidents not already there, so re-runs add nothing; existing
+    # rows are streamed for their IDs and never rewritten
+    incidents_path = "data/incidents.csv"
+    fieldnames = list(additional_incidents[0])
+    existing_ids = set()
+    if os.path.exists(incidents_path):
+        with open(incidents_path, newline="") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or fieldnames
+            existing_ids = {row["incident_id"] for row in reader}
+    
+    new_incidents = [incident for incident in additional_incidents
+                     if incident["incident_id"] not in existing_ids]
+    if not new_incidents:
+        return
+    
+    with open(incidents_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+        if f.tell() == 0:
+            writer.writeheader()
+        writer.writerows(new_incidents)
+
+SAMPLE_DATA_SENTINEL = "data/.sample_data_ready"
+
+def _sample_data_signature():
+    """Hash of every sample-data generator's source, so editing one regenerates the data"""
+    generators = (
+        setup_sample_data, _create_missing, create_sample_logs, create_sample_code,
+        create_sample_database, _insert_metrics, create_sample_incidents,
+        create_extended_sample_data, create_performance_logs, create_security_logs,
+        create_additional_code_samples, create_extended_metrics, create_more_incidents,
+    )
+    digest = hashlib.sha256()
+    for generator in generators:
+        digest.update(inspect.getsource(generator).encode())
+    return digest.hexdigest()
+
+def ensure_sample_data() -> bool:
+    """Create the base and extended sample data unless this generator version already has
+    
+    Returns True if the generators ran, False if the sentinel showed the data is current.
+    When the generators changed since the data was made, every file is regenerated.
+    """
+    signature = _sample_data_signature()
+    data_paths = (Config.LOG_DIR, Config.CODEBASE_DIR, Config.METRICS_DB, Config.INCIDENTS_CSV)
+    try:
+        stale = Path(SAMPLE_DATA_SENTINEL).read_text() != signature
+    except FileNotFoundError:
+        stale = True
+    if not stale and all(os.path.exists(path) for path in data_paths):
+        return False
+    
+    # Data from older generators must be rewritten, not kept because it exists
+    setup_sample_data(force=stale)
+    create_extended_sample_data(force=stale)
+    Path(SAMPLE_DATA_SENTINEL).write_text(signature)
+    return True
 
 # ==============================================================================
 # MAIN EXECUTION WITH ENHANCED FEATURES
 # ==============================================================================
 
 if __name__ == "__main__":
+    _configure_logging()
+    
+    # Event loops that CrewAI and LangChain create use libuv when it is available
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+    
     print("🚀 Multi-Agent Operational Intelligence System")
     print("=" * 50)
     
-    # Setup sample data
+    # Setup sample data; skipped when an earlier run already generated it
     print("\n📁 Setting up comprehensive sample data...")
-    setup_sample_data()
-    create_extended_sample_data()
+    if not ensure_sample_data():
+        print("✅ Sample data already up to date")
     
     # Initialize the enhanced crew system
     crew_system = OpsAnalysisCrew()
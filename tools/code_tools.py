@@ -2,15 +2,189 @@
 import os
 import ast
 import re
-import glob
+import functools
+import collections
+import dbm
+import itertools
+import multiprocessing
+import shelve
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from crewai_tools import BaseTool
 
+# Keyword triggers and guards of _check_line_issues, fused into one pattern so
+# each line is scanned once and match.lastgroup names the rule. Every rule is a
+# zero-width lookahead, so overlapping keywords are all seen; no rule's keyword
+# is a prefix of another rule's, so one position never belongs to two rules.
+_LINE_RULES = {
+    'null_access': r"\.(?:get|fetch|find)\(",  # case-sensitive, like the original check
+    'null_guard': r"(?i:null|none)",
+    'resource': r"(?i:(?:connection|open|stream)\()",
+    'resource_guard': r"(?i:close\(\)|with)",
+    'sql': r"(?i:sql|query|execute)",
+    'sql_input': r"(?i:input|request|param)",
+    'credential': r"(?i:password|apikey|secret|token)",
+    'quote': r"[\"']",
+    'sleep': r"(?i:sleep\(|thread\.sleep|time\.sleep)",
+    'todo': r"(?i:todo|fixme)",
+}
+_LINE_RULES_RE = re.compile("|".join(f"(?=(?P<{name}>{pattern}))" for name, pattern in _LINE_RULES.items()))
+
+# Anything that can make _check_line_issues report a line: a rule trigger (the
+# guards only ever suppress), the indented inner 'for', or a line over 120
+# characters. Searched over the whole file, so lines without any are never split out.
+_LINE_CANDIDATE_RE = re.compile("|".join([
+    *(_LINE_RULES[name] for name in ('null_access', 'resource', 'sql', 'credential', 'sleep', 'todo')),
+    re.escape('    for '),
+    r"^[^\n]{121}",
+]), re.MULTILINE)
+
+@dataclass(slots=True)
+class Issue:
+    """One code analysis finding; slots keep the many per-line findings small"""
+    file: str
+    line: int
+    issue: str
+    severity: str
+    type: str
+    code: str = 'N/A'
+
+ISSUE_CATEGORIES = ('issues', 'security_issues', 'performance_issues', 'code_smells')
+
+class _PythonAnalyzer(ast.NodeVisitor):
+    """Single traversal of a Python module's AST; the visitor dispatches by node
+    type, so only the node types with checks run any Python code of ours"""
+    
+    def __init__(self, file_path: str, issues: Dict[str, List[Issue]]):
+        self.file_path = file_path
+        self.issues = issues
+    
+    def visit_FunctionDef(self, node):
+        # Check for functions with too many parameters
+        if len(node.args.args) > 7:
+            self.issues['code_smells'].append(Issue(
+                file=self.file_path,
+                line=node.lineno,
+                issue=f'Function {node.name} has {len(node.args.args)} parameters (consider refactoring)',
+                severity='MEDIUM',
+                type='TooManyParameters',
+                code=f'def {node.name}(...)'
+            ))
+        self.generic_visit(node)
+    
+    def visit_ExceptHandler(self, node):
+        # Check for bare except clauses
+        if node.type is None:
+            self.issues['issues'].append(Issue(
+                file=self.file_path,
+                line=node.lineno,
+                issue='Bare except clause - should specify exception type',
+                severity='MEDIUM',
+                type='BareExcept',
+                code='except:'
+            ))
+        self.generic_visit(node)
+
+# Below this many files or bytes a process pool costs more to start than it
+# saves; the sample codebase (a handful of small files) always runs serially
+PARALLEL_MIN_FILES = 8
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+def _pool_worthwhile(paths: List[str]) -> bool:
+    """Whether a batch is big enough, in files and bytes, for a process pool to pay off"""
+    if len(paths) < PARALLEL_MIN_FILES:
+        return False
+    total_bytes = 0
+    for path in paths:
+        try:
+            total_bytes += os.path.getsize(path)
+        except OSError:
+            pass
+        if total_bytes >= PARALLEL_MIN_BYTES:
+            return True
+    return False
+
+def _pool_context():
+    """Workers start from a clean server process rather than a fork of this one,
+    which may have other threads (async CrewAI tasks) holding locks"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+# Bump when the analysis rules change, so results cached by older rules are ignored
+ANALYSIS_CACHE_VERSION = 4
+# Past this many entries the cache file is recreated empty, which also compacts it
+ANALYSIS_CACHE_MAX_ENTRIES = 4096
+# dbm does no locking of its own, and tool calls on other threads share the file
+_analysis_cache_lock = threading.Lock()
+
+def _analysis_cache_key(file_path: str) -> Optional[str]:
+    """Key for a file's cached scan: its stat identity alone, so checking for a hit
+    costs a stat and every task and query shares the one entry per file version"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return "\0".join(map(str, (ANALYSIS_CACHE_VERSION, file_path, stat.st_mtime_ns, stat.st_size)))
+
+def _file_flags(file_path: str, content_lower: str, task_id: str, query: str):
+    """(task_related, deep) for a file: whether it mentions the task, and whether
+    the Python AST pass is worth running for this task or query"""
+    task_related = bool(task_id) and task_id.lower() in content_lower
+    deep = file_path.endswith('.py') and (task_related or bool(query) and query.lower() in content_lower)
+    return task_related, deep
+
+def _scan_covers(file_path: str, scan: Dict[str, Any], task_id: str, query: str) -> bool:
+    """Whether a cached scan has everything this task and query need; a scan made
+    without the AST pass cannot serve a query that wants it"""
+    return scan['python_issues'] is not None or not _file_flags(file_path, scan['content_lower'], task_id, query)[1]
+
+def _open_analysis_cache(path: str, flag: str = "c"):
+    """Open the analysis cache, or return None when it cannot be opened (e.g. another process holds it)"""
+    try:
+        return shelve.open(path, flag)
+    except dbm.error:
+        return None
+
+# Reported in this order, as the per-extension globs used to return them
+CODE_EXTENSIONS = (".py", ".java", ".js", ".cpp", ".c", ".go", ".rb", ".php")
+
+def _walk_files(directory: str):
+    """Yield the files under directory, depth first, skipping hidden and unreadable entries like glob"""
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir():
+                yield from _walk_files(entry.path)
+            else:
+                yield entry
+
+@functools.lru_cache(maxsize=None)
+def _worker_tool():
+    # One tool per worker process; its analysis methods keep no per-call state
+    return CodeAnalysisTool()
+
+def _analyze_batch(args):
+    """Scan a batch of files in a worker process"""
+    file_paths, task_id, query = args
+    tool = _worker_tool()
+    return [(file_path, tool._scan_file(file_path, task_id, query)) for file_path in file_paths]
+
 class CodeAnalysisTool(BaseTool):
     """Tool for analyzing code for bugs, security issues, and performance problems"""
     
     name: str = "code_analysis_tool"
     description: str = "Analyzes codebase for bugs, security vulnerabilities, and performance issues"
+    max_workers: Optional[int] = None  # Worker processes; None uses every CPU
+    batch_size: int = 64  # Most files handed to a worker at once
+    cache_path: Optional[str] = "data/.code_analysis_cache"  # Per-file results; None disables caching
     
     def _run(self, task_id: str = "", query: str = "", code_directory: str = "data/codebase") -> str:
         """
@@ -36,15 +210,15 @@ class CodeAnalysisTool(BaseTool):
                 'security_issues': [],
                 'performance_issues': [],
                 'code_smells': [],
-                'task_related_files': []
+                'task_related_files': [],
+                'severity_counts': collections.Counter()
             }
             
-            for file_path in code_files:
-                file_analysis = self._analyze_file(file_path, task_id, query)
-                analysis_results['issues'].extend(file_analysis['issues'])
-                analysis_results['security_issues'].extend(file_analysis['security_issues'])
-                analysis_results['performance_issues'].extend(file_analysis['performance_issues'])
-                analysis_results['code_smells'].extend(file_analysis['code_smells'])
+            for file_path, file_analysis in self._analyze_files(code_files, task_id, query):
+                # Severities are counted as issues are merged, so the report needs no extra pass
+                for category in ISSUE_CATEGORIES:
+                    analysis_results[category].extend(file_analysis[category])
+                    analysis_results['severity_counts'].update(issue.severity for issue in file_analysis[category])
                 
                 if file_analysis['task_related']:
                     analysis_results['task_related_files'].append(file_path)
@@ -57,64 +231,154 @@ class CodeAnalysisTool(BaseTool):
         except Exception as e:
             return f"Error analyzing code: {str(e)}"
     
-    def _find_code_files(self, directory: str) -> List[str]:
-        """Find all code files in the directory"""
-        extensions = ["*.py", "*.java", "*.js", "*.cpp", "*.c", "*.go", "*.rb", "*.php"]
-        code_files = []
+    def _analyze_files(self, code_files: List[str], task_id: str, query: str):
+        """Yield (file_path, analysis) in file order, reusing cached scans of unchanged files"""
+        if not self.cache_path:
+            for file_path, scan in self._analyze_uncached(code_files, task_id, query):
+                yield file_path, self._finish_analysis(file_path, scan, task_id, query)
+            return
         
-        for ext in extensions:
-            code_files.extend(glob.glob(os.path.join(directory, "**", ext), recursive=True))
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        keys = {file_path: _analysis_cache_key(file_path) for file_path in code_files}
         
-        return code_files
+        # Only this process touches the cache, and never while analyzing; workers
+        # just scan the misses. Without the cache every file is a miss.
+        scans = {}
+        with _analysis_cache_lock:
+            cache = _open_analysis_cache(self.cache_path)
+            if cache is not None:
+                with cache:
+                    for file_path, key in keys.items():
+                        scan = cache.get(key) if key is not None else None
+                        if scan is not None and _scan_covers(file_path, scan, task_id, query):
+                            scans[file_path] = scan
+        misses = [file_path for file_path in code_files if file_path not in scans]
+        
+        fresh = dict(self._analyze_uncached(misses, task_id, query))
+        scans.update(fresh)
+        storable = {keys[file_path]: scan for file_path, scan in fresh.items() if keys[file_path] is not None}
+        if storable:
+            with _analysis_cache_lock:
+                cache = _open_analysis_cache(self.cache_path)
+                if cache is not None and len(cache) + len(storable) > ANALYSIS_CACHE_MAX_ENTRIES:
+                    cache.close()
+                    cache = _open_analysis_cache(self.cache_path, "n")
+                if cache is not None:
+                    with cache:
+                        cache.update(storable)
+        
+        for file_path in code_files:
+            yield file_path, self._finish_analysis(file_path, scans[file_path], task_id, query)
+    
+    def _analyze_uncached(self, code_files: List[str], task_id: str, query: str):
+        """Yield (file_path, scan) in file order, across worker processes for larger trees"""
+        if not _pool_worthwhile(code_files):
+            for file_path in code_files:
+                yield file_path, self._scan_file(file_path, task_id, query)
+            return
+        
+        # Smaller batches when there are few files, so every worker gets some
+        workers = self.max_workers or os.cpu_count() or 1
+        size = max(1, min(self.batch_size, -(-len(code_files) // workers)))
+        batches = [(code_files[i:i + size], task_id, query) for i in range(0, len(code_files), size)]
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_pool_context()) as executor:
+            for results in executor.map(_analyze_batch, batches):
+                yield from results
+    
+    def _find_code_files(self, directory: str) -> List[str]:
+        """Find all code files in the directory, in a single walk of the tree"""
+        by_extension = {extension: [] for extension in CODE_EXTENSIONS}
+        for entry in _walk_files(directory):
+            files = by_extension.get(os.path.splitext(entry.name)[1])
+            if files is not None:
+                files.append(entry.path)
+        
+        return [path for files in by_extension.values() for path in files]
     
     def _analyze_file(self, file_path: str, task_id: str, query: str) -> Dict[str, Any]:
         """Analyze a single code file for issues"""
+        return self._finish_analysis(file_path, self._scan_file(file_path, task_id, query), task_id, query)
+    
+    def _finish_analysis(self, file_path: str, scan: Dict[str, Any], task_id: str, query: str) -> Dict[str, Any]:
+        """Build a file's analysis for this task and query from its scan"""
+        task_related, deep = _file_flags(file_path, scan['content_lower'], task_id, query)
+        analysis = {category: list(issues) for category, issues in scan['findings'].items()}
+        analysis['task_related'] = task_related
+        # The AST findings follow the per-line ones, as the other file-level findings do
+        if deep and scan['python_issues']:
+            for category, issues in scan['python_issues'].items():
+                analysis[category].extend(issues)
+        return analysis
+    
+    def _scan_file(self, file_path: str, task_id: str, query: str) -> Dict[str, Any]:
+        """
+        Scan a single code file: the part of its analysis that does not depend on the
+        task or query, which is what gets cached
+        
+        Returns:
+            The per-line and Java findings, the lowercased content the task and query
+            are matched against, and the Python AST findings (None unless this task
+            or query needed the AST pass)
+        """
         analysis = {
             'issues': [],
             'security_issues': [],
             'performance_issues': [],
-            'code_smells': [],
-            'task_related': False
+            'code_smells': []
         }
+        scan = {'findings': analysis, 'content_lower': '', 'python_issues': None}
         
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-                lines = content.split('\n')
             
-            # Check if file is related to task
-            if task_id and task_id.lower() in content.lower():
-                analysis['task_related'] = True
+            content_lower = content.lower()
+            scan['content_lower'] = content_lower
             
-            # Analyze each line
-            for line_num, line in enumerate(lines, 1):
-                line_stripped = line.strip()
+            # Analyze each candidate line; bound once here rather than looked up on every line
+            check_line_issues = self._check_line_issues
+            add_general = analysis['issues'].extend
+            add_security = analysis['security_issues'].extend
+            add_performance = analysis['performance_issues'].extend
+            add_code_smells = analysis['code_smells'].extend
+            find_candidate = _LINE_CANDIDATE_RE.search
+            pos, line_num = 0, 1  # Start of the next unchecked line, and its number
+            while (match := find_candidate(content, pos)) is not None:
+                start = content.rfind('\n', 0, match.start()) + 1
+                end = content.find('\n', match.start())
+                if end == -1:
+                    end = len(content)
+                line_num += content.count('\n', pos, start)
                 
                 # Check for various issue types
-                issues = self._check_line_issues(line_stripped, file_path, line_num)
-                analysis['issues'].extend(issues['general'])
-                analysis['security_issues'].extend(issues['security'])
-                analysis['performance_issues'].extend(issues['performance'])
-                analysis['code_smells'].extend(issues['code_smells'])
+                issues = check_line_issues(content[start:end].strip(), file_path, line_num)
+                add_general(issues['general'])
+                add_security(issues['security'])
+                add_performance(issues['performance'])
+                add_code_smells(issues['code_smells'])
+                pos, line_num = end + 1, line_num + 1
             
-            # Additional file-level analysis
+            # Additional file-level analysis; Java findings join the per-line ones,
+            # while the AST walk is only worth it for files the task or query points at
             if file_path.endswith('.py'):
-                analysis.update(self._analyze_python_file(file_path, content))
+                if _file_flags(file_path, content_lower, task_id, query)[1]:
+                    scan['python_issues'] = self._analyze_python_file(file_path, content)
             elif file_path.endswith('.java'):
-                analysis.update(self._analyze_java_file(file_path, content))
+                for category, issues in self._analyze_java_file(file_path, content).items():
+                    analysis[category].extend(issues)
         
         except Exception as e:
-            analysis['issues'].append({
-                'file': file_path,
-                'line': 0,
-                'issue': f"Error analyzing file: {str(e)}",
-                'severity': 'LOW',
-                'type': 'AnalysisError'
-            })
+            analysis['issues'].append(Issue(
+                file=file_path,
+                line=0,
+                issue=f"Error analyzing file: {str(e)}",
+                severity='LOW',
+                type='AnalysisError'
+            ))
         
-        return analysis
+        return scan
     
-    def _check_line_issues(self, line: str, file_path: str, line_num: int) -> Dict[str, List]:
+    def _check_line_issues(self, line: str, file_path: str, line_num: int) -> Dict[str, List[Issue]]:
         """Check a single line for various types of issues"""
         issues = {
             'general': [],
@@ -123,99 +387,100 @@ class CodeAnalysisTool(BaseTool):
             'code_smells': []
         }
         
-        line_lower = line.lower()
+        found = {match.lastgroup for match in _LINE_RULES_RE.finditer(line)}
         
         # Null pointer issues
-        if any(pattern in line for pattern in ['.get(', '.fetch(', '.find(']):
-            if 'null' not in line_lower and 'none' not in line_lower:
-                issues['general'].append({
-                    'file': file_path,
-                    'line': line_num,
-                    'issue': 'Potential null pointer access without null check',
-                    'severity': 'HIGH',
-                    'type': 'NullPointerRisk',
-                    'code': line.strip()
-                })
+        if 'null_access' in found:
+            if 'null_guard' not in found:
+                issues['general'].append(Issue(
+                    file=file_path,
+                    line=line_num,
+                    issue='Potential null pointer access without null check',
+                    severity='HIGH',
+                    type='NullPointerRisk',
+                    code=line.strip()
+                ))
         
         # Resource leaks
-        if any(pattern in line_lower for pattern in ['connection(', 'open(', 'stream(']):
-            if 'close()' not in line_lower and 'with' not in line_lower:
-                issues['general'].append({
-                    'file': file_path,
-                    'line': line_num,
-                    'issue': 'Potential resource leak - missing close()',
-                    'severity': 'MEDIUM',
-                    'type': 'ResourceLeak',
-                    'code': line.strip()
-                })
+        if 'resource' in found:
+            if 'resource_guard' not in found:
+                issues['general'].append(Issue(
+                    file=file_path,
+                    line=line_num,
+                    issue='Potential resource leak - missing close()',
+                    severity='MEDIUM',
+                    type='ResourceLeak',
+                    code=line.strip()
+                ))
         
         # Security issues
-        if any(pattern in line_lower for pattern in ['sql', 'query', 'execute']):
-            if any(vuln in line_lower for vuln in ['input', 'request', 'param']):
-                issues['security'].append({
-                    'file': file_path,
-                    'line': line_num,
-                    'issue': 'Potential SQL injection vulnerability',
-                    'severity': 'CRITICAL',
-                    'type': 'SQLInjection',
-                    'code': line.strip()
-                })
+        if 'sql' in found:
+            if 'sql_input' in found:
+                issues['security'].append(Issue(
+                    file=file_path,
+                    line=line_num,
+                    issue='Potential SQL injection vulnerability',
+                    severity='CRITICAL',
+                    type='SQLInjection',
+                    code=line.strip()
+                ))
         
         # Hardcoded credentials
-        if any(pattern in line_lower for pattern in ['password', 'apikey', 'secret', 'token']):
-            if '=' in line and any(quote in line for quote in ['"', "'"]):
-                issues['security'].append({
-                    'file': file_path,
-                    'line': line_num,
-                    'issue': 'Potential hardcoded credential',
-                    'severity': 'HIGH',
-                    'type': 'HardcodedCredential',
-                    'code': line.strip()
-                })
+        if 'credential' in found:
+            if '=' in line and 'quote' in found:
+                issues['security'].append(Issue(
+                    file=file_path,
+                    line=line_num,
+                    issue='Potential hardcoded credential',
+                    severity='HIGH',
+                    type='HardcodedCredential',
+                    code=line.strip()
+                ))
         
         # Performance issues
-        if any(pattern in line_lower for pattern in ['sleep(', 'thread.sleep', 'time.sleep']):
-            issues['performance'].append({
-                'file': file_path,
-                'line': line_num,
-                'issue': 'Synchronous sleep may block execution',
-                'severity': 'MEDIUM',
-                'type': 'PerformanceBlock',
-                'code': line.strip()
-            })
+        if 'sleep' in found:
+            issues['performance'].append(Issue(
+                file=file_path,
+                line=line_num,
+                issue='Synchronous sleep may block execution',
+                severity='MEDIUM',
+                type='PerformanceBlock',
+                code=line.strip()
+            ))
         
         # Nested loops (simplified detection)
-        if line_lower.strip().startswith('for ') and '    for ' in line:
-            issues['performance'].append({
-                'file': file_path,
-                'line': line_num,
-                'issue': 'Nested loop detected - potential performance impact',
-                'severity': 'MEDIUM',
-                'type': 'NestedLoop',
-                'code': line.strip()
-            })
+        # Only the first four characters need lowercasing, not the whole line
+        if line.strip()[:4].lower() == 'for ' and '    for ' in line:
+            issues['performance'].append(Issue(
+                file=file_path,
+                line=line_num,
+                issue='Nested loop detected - potential performance impact',
+                severity='MEDIUM',
+                type='NestedLoop',
+                code=line.strip()
+            ))
         
         # Code smells
         if len(line.strip()) > 120:
-            issues['code_smells'].append({
-                'file': file_path,
-                'line': line_num,
-                'issue': f'Long line ({len(line)} characters) - consider refactoring',
-                'severity': 'LOW',
-                'type': 'LongLine',
-                'code': line.strip()[:100] + '...'
-            })
+            issues['code_smells'].append(Issue(
+                file=file_path,
+                line=line_num,
+                issue=f'Long line ({len(line)} characters) - consider refactoring',
+                severity='LOW',
+                type='LongLine',
+                code=line.strip()[:100] + '...'
+            ))
         
         # TODO comments
-        if 'todo' in line_lower or 'fixme' in line_lower:
-            issues['code_smells'].append({
-                'file': file_path,
-                'line': line_num,
-                'issue': 'TODO/FIXME comment found',
-                'severity': 'LOW',
-                'type': 'TodoComment',
-                'code': line.strip()
-            })
+        if 'todo' in found:
+            issues['code_smells'].append(Issue(
+                file=file_path,
+                line=line_num,
+                issue='TODO/FIXME comment found',
+                severity='LOW',
+                type='TodoComment',
+                code=line.strip()
+            ))
         
         return issues
     
@@ -231,41 +496,17 @@ class CodeAnalysisTool(BaseTool):
         try:
             # Parse AST for more sophisticated analysis
             tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Check for functions with too many parameters
-                    if len(node.args.args) > 7:
-                        additional_issues['code_smells'].append({
-                            'file': file_path,
-                            'line': node.lineno,
-                            'issue': f'Function {node.name} has {len(node.args.args)} parameters (consider refactoring)',
-                            'severity': 'MEDIUM',
-                            'type': 'TooManyParameters',
-                            'code': f'def {node.name}(...)'
-                        })
-                
-                # Check for bare except clauses
-                elif isinstance(node, ast.ExceptHandler):
-                    if node.type is None:
-                        additional_issues['issues'].append({
-                            'file': file_path,
-                            'line': node.lineno,
-                            'issue': 'Bare except clause - should specify exception type',
-                            'severity': 'MEDIUM',
-                            'type': 'BareExcept',
-                            'code': 'except:'
-                        })
+            _PythonAnalyzer(file_path, additional_issues).visit(tree)
         
         except SyntaxError as e:
-            additional_issues['issues'].append({
-                'file': file_path,
-                'line': e.lineno or 0,
-                'issue': f'Syntax error: {e.msg}',
-                'severity': 'CRITICAL',
-                'type': 'SyntaxError',
-                'code': str(e)
-            })
+            additional_issues['issues'].append(Issue(
+                file=file_path,
+                line=e.lineno or 0,
+                issue=f'Syntax error: {e.msg}',
+                severity='CRITICAL',
+                type='SyntaxError',
+                code=str(e)
+            ))
         except Exception:
             pass  # Skip AST analysis if it fails
         
@@ -287,49 +528,38 @@ class CodeAnalysisTool(BaseTool):
             
             # Check for potential null pointer exceptions
             if '.get(' in line and 'null' not in line.lower():
-                additional_issues['issues'].append({
-                    'file': file_path,
-                    'line': line_num,
-                    'issue': 'Potential NullPointerException in Java code',
-                    'severity': 'HIGH',
-                    'type': 'JavaNullPointer',
-                    'code': line.strip()
-                })
+                additional_issues['issues'].append(Issue(
+                    file=file_path,
+                    line=line_num,
+                    issue='Potential NullPointerException in Java code',
+                    severity='HIGH',
+                    type='JavaNullPointer',
+                    code=line.strip()
+                ))
             
             # Check for resource management
             if any(pattern in line for pattern in ['new FileInputStream', 'new Connection', 'new Socket']):
                 if 'try-with-resources' not in content and 'finally' not in content:
-                    additional_issues['issues'].append({
-                        'file': file_path,
-                        'line': line_num,
-                        'issue': 'Resource not managed with try-with-resources',
-                        'severity': 'MEDIUM',
-                        'type': 'JavaResourceLeak',
-                        'code': line.strip()
-                    })
+                    additional_issues['issues'].append(Issue(
+                        file=file_path,
+                        line=line_num,
+                        issue='Resource not managed with try-with-resources',
+                        severity='MEDIUM',
+                        type='JavaResourceLeak',
+                        code=line.strip()
+                    ))
         
         return additional_issues
     
     def _generate_code_report(self, task_id: str, analysis_results: Dict) -> str:
         """Generate comprehensive code analysis report"""
         
-        total_issues = (len(analysis_results['issues']) + 
-                       len(analysis_results['security_issues']) + 
-                       len(analysis_results['performance_issues']) + 
-                       len(analysis_results['code_smells']))
-        
-        # Count by severity
-        severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-        all_issues = (analysis_results['issues'] + 
-                     analysis_results['security_issues'] + 
-                     analysis_results['performance_issues'] + 
-                     analysis_results['code_smells'])
+        # Counted by severity while the per-file results were merged
+        severity_counts = analysis_results['severity_counts']
+        total_issues = sum(severity_counts.values())
+        all_issues = itertools.chain.from_iterable(analysis_results[category] for category in ISSUE_CATEGORIES)
         
-        for issue in all_issues:
-            severity = issue.get('severity', 'LOW')
-            severity_counts[severity] += 1
-        
-        report = f"""
+        parts = [f"""
 ========================================
 CODE ANALYSIS REPORT - {task_id}
 ========================================
@@ -351,17 +581,19 @@ ISSUE CATEGORIES:
 - Security Issues: {len(analysis_results['security_issues'])}
 - Performance Issues: {len(analysis_results['performance_issues'])}
 - Code Smells: {len(analysis_results['code_smells'])}
-"""
+"""]
 
-        # Critical and High severity issues
-        critical_high_issues = [issue for issue in all_issues 
-                               if issue.get('severity') in ['CRITICAL', 'HIGH']]
+        # Critical and High severity issues; only the top 10 are shown, so stop there
+        critical_high_issues = list(itertools.islice(
+            (issue for issue in all_issues if issue.severity in ['CRITICAL', 'HIGH']), 10))
         
         if critical_high_issues:
-            report += f"""
+            parts.append(f"""
 CRITICAL & HIGH PRIORITY ISSUES:
-"""
-            for i, issue in enumerate(critical_high_issues[:10], 1):  # Show top 10
-                report += f"{i}. [{issue['severity']}] {issue['type']}: {issue['issue']}\n"
-                report += f"   File: {issue['file']}, Line: {issue['line']}\n"
-                report += f"   Code: {issue.get('code', 'N/A')}\n\n"
+""")
+            for i, issue in enumerate(critical_high_issues, 1):
+                parts.append(f"{i}. [{issue.severity}] {issue.type}: {issue.issue}\n")
+                parts.append(f"   File: {issue.file}, Line: {issue.line}\n")
+                parts.append(f"   Code: {issue.code}\n\n")
+        
+        return "".join(parts)
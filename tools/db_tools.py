@@ -1,18 +1,53 @@
+import atexit
 import sqlite3
+import threading
 
-def fetch_task_metrics(task_id):
-    conn = sqlite3.connect("data/metrics.db")
-    cursor = conn.cursor()
+METRICS_DB = "data/metrics.db"
+_METRICS_SQL = """
+    SELECT start_time, end_time, duration
+    FROM task_metrics
+    WHERE task_id = ?
+"""
 
-    try:
-        cursor.execute("""
-            SELECT start_time, end_time, duration
-            FROM task_metrics
-            WHERE task_id = ?
-        """, (task_id,))
+# One connection for the whole process, shared behind a lock and closed once at
+# exit, so short-lived worker threads never leave connections behind. sqlite3
+# reuses the prepared statement for the identical SQL string on every call.
+_conn = None
+_lock = threading.Lock()
+
+def _close_connection():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+atexit.register(_close_connection)
 
-        row = cursor.fetchone()
-        conn.close()
+def _get_connection():
+    # Callers hold _lock
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(METRICS_DB, isolation_level=None, check_same_thread=False)
+        try:
+            conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-64000;
+            """)
+            # Idempotent, and runs only when the shared connection is first
+            # opened, so lookups by task_id never fall back to a table scan
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_metrics_task_id ON task_metrics(task_id)")
+        except Exception:
+            conn.close()
+            raise
+        _conn = conn
+    return _conn
+
+def fetch_task_metrics(task_id):
+    try:
+        with _lock:
+            row = _get_connection().execute(_METRICS_SQL, (task_id,)).fetchone()
 
         if row:
             return {
@@ -24,5 +59,4 @@ def fetch_task_metrics(task_id):
             return None
 
     except Exception as e:
-        conn.close()
         return None
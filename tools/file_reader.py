@@ -0,0 +1,15 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# File reads release the GIL, so threads overlap the IO of independent files
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def map_files(func, paths, *args):
+    # Submit every read at once and collect results in path order; a single
+    # file is read inline since a pool buys nothing there
+    if len(paths) < 2:
+        return [func(path, *args) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(paths))) as executor:
+        return list(executor.map(func, paths, *(repeat(arg) for arg in args)))
@@ -1,21 +1,62 @@
-import pandas as pd
+import collections
+import csv
+import functools
+import os
+import re
+
+INCIDENTS_CSV = "data/incidents.csv"
+SUMMARY_CHARS = 50
+
+_TOKEN_RE = re.compile(r"\w+")
+
+@functools.lru_cache(maxsize=1)
+def _load_incidents(path, mtime):
+    # mtime is part of the cache key so an edited CSV is reloaded
+    rows = []
+    index = collections.defaultdict(list)
+    with open(path, newline="") as file:
+        for i, row in enumerate(csv.DictReader(file)):
+            desc_lower = (row.get("description") or "").lower()
+            rows.append((row, desc_lower))
+            for token in set(_TOKEN_RE.findall(desc_lower)):
+                index[token].append(i)
+    return rows, index
+
+def _lookup(rows, index, term):
+    # Rows whose description contains term. Inner words of the term must be whole
+    # words in the description; the outer ones may be cut off mid-word, so they
+    # match by suffix/prefix (or substring, for a one-word term). The whole term
+    # is then confirmed on the few candidates that are left.
+    tokens = _TOKEN_RE.findall(term)
+    if not tokens:
+        candidates = range(len(rows))
+    else:
+        def postings(matches):
+            return set().union(*(ids for token, ids in index.items() if matches(token)))
+
+        first, last = tokens[0], tokens[-1]
+        if len(tokens) == 1:
+            candidates = postings(lambda token: first in token)
+        else:
+            candidates = postings(lambda token: token.endswith(first)) & postings(lambda token: token.startswith(last))
+            for token in tokens[1:-1]:
+                candidates &= set(index.get(token, ()))
+    # Like str.contains, an empty term matches every row with a description
+    return [rows[i][0] for i in sorted(candidates) if rows[i][1] and term in rows[i][1]]
 
 def search_similar_incidents(task_id, error_summary):
     try:
-        df = pd.read_csv("data/incidents.csv")
-        matched = df[df['description'].str.contains(task_id, case=False, na=False)]
+        rows, index = _load_incidents(INCIDENTS_CSV, os.path.getmtime(INCIDENTS_CSV))
 
-        if matched.empty:
-            matched = df[df['description'].str.contains(error_summary[:50], case=False, na=False)]
+        matched = _lookup(rows, index, task_id.lower())
 
-        if matched.empty:
-            return f"No similar incidents found for task {task_id}."
+        if not matched:
+            matched = _lookup(rows, index, error_summary[:SUMMARY_CHARS].lower())
 
-        incidents = []
-        for _, row in matched.iterrows():
-            incidents.append(f"Date: {row['date']}, Summary: {row['description']}")
+        if not matched:
+            return f"No similar incidents found for task {task_id}."
 
-        return "\n".join(incidents)
+        return "\n".join(f"Date: {row['date']}, Summary: {row['description']}" for row in matched)
 
     except Exception as e:
         return f"Incident lookup failed: {str(e)}"
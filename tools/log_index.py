@@ -0,0 +1,75 @@
+import bisect
+import mmap
+import os
+import pickle
+import re
+import threading
+from tools.file_reader import map_files
+
+INDEX_PATH = "data/log_index.pickle"
+
+_TID_RE = re.compile(rb"TID[-_]?\d+")
+_lock = threading.Lock()
+
+# path -> ((mtime_ns, size), sorted task ids seen in that file)
+_files = None
+
+def _scan_task_ids(path):
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return tuple(sorted({match.decode() for match in _TID_RE.findall(mm)}))
+
+def _load_index():
+    try:
+        with open(INDEX_PATH, "rb") as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+
+def _save_index(files):
+    try:
+        tmp_path = INDEX_PATH + ".tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(files, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, INDEX_PATH)
+    except OSError:
+        pass
+
+def _refresh(dir_signature):
+    # Rescan only the files whose mtime or size moved since they were indexed
+    global _files
+    if _files is None:
+        _files = _load_index()
+
+    current = {path: (mtime, size) for path, mtime, size in dir_signature}
+    stale = [path for path, stamp in current.items() if _files.get(path, (None,))[0] != stamp]
+    removed = _files.keys() - current.keys()
+    if not stale and not removed:
+        return
+
+    for path, task_ids in zip(stale, map_files(_scan_task_ids, stale)):
+        _files[path] = (current[path], task_ids)
+    for path in removed:
+        del _files[path]
+    _save_index(_files)
+
+def _has_prefix(task_ids, prefix):
+    i = bisect.bisect_left(task_ids, prefix)
+    return i < len(task_ids) and task_ids[i].startswith(prefix)
+
+def files_for(task_ids, dir_signature):
+    # A task id found anywhere in a line starts one of the indexed ids
+    # (TID-1 inside TID-12345), so a prefix hit keeps substring matching intact.
+    # Ids the index cannot see fall back to every file.
+    paths = [path for path, _, _ in dir_signature]
+    if not all(_TID_RE.fullmatch(task_id.encode()) for task_id in task_ids):
+        return paths
+
+    with _lock:
+        _refresh(dir_signature)
+        return [
+            path for path in paths
+            if any(_has_prefix(_files[path][1], task_id) for task_id in task_ids)
+        ]
@@ -1,17 +1,156 @@
 
 import os
 import json
-import glob
+import functools
+import heapq
+import mmap
+import multiprocessing
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from crewai_tools import BaseTool
 import re
 
+@dataclass(slots=True)
+class LogEntry:
+    """One log line of interest; the optional fields depend on why it was kept"""
+    file: str
+    line_number: int
+    content: str
+    timestamp: Optional[str]
+    error_type: Optional[str] = None
+    severity: Optional[str] = None
+    match_type: Optional[str] = None
+
+# Below this many files or bytes a process pool costs more to start than it
+# saves; the sample logs (a handful of small files) always parse serially
+PARALLEL_MIN_FILES = 8
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+LOG_READ_BUFFER_BYTES = 1024 * 1024
+LOG_EXTENSIONS = (".log", ".txt", ".out")
+
+# Common timestamp patterns, tried in this order
+_TIMESTAMP_PATTERNS = (
+    re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'),  # 2024-01-15 14:30:45
+    re.compile(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}'),  # 01/15/2024 14:30:45
+    re.compile(r'\w{3} \d{2} \d{2}:\d{2}:\d{2}'),        # Jan 15 14:30:45
+)
+# All of them in one pass; group N is _TIMESTAMP_PATTERNS[N - 1]
+_TIMESTAMP_RE = re.compile("|".join(f"({pattern.pattern})" for pattern in _TIMESTAMP_PATTERNS))
+
+# Error-line keywords; a line is an error line if it contains any of them
+_ERROR_LINE_KEYWORDS = frozenset({
+    'error', 'exception', 'failed', 'failure', 'timeout',
+    'null pointer', 'connection refused', 'out of memory',
+    'stack trace', 'fatal', 'critical', 'alert'
+})
+# First matching rule wins; a rule matches when the line has a keyword from
+# each of its keyword sets
+_ERROR_TYPE_RULES = (
+    ('NullPointerException', (frozenset({'null pointer', 'nullpointerexception'}),)),
+    ('TimeoutError', (frozenset({'timeout'}),)),
+    ('ConnectionError', (frozenset({'connection'}), frozenset({'refused', 'failed'}))),
+    ('MemoryError', (frozenset({'memory'}),)),
+    ('SecurityError', (frozenset({'security', 'unauthorized'}),)),
+    ('DatabaseError', (frozenset({'database', 'sql'}),)),
+)
+_SEVERITY_RULES = (
+    ('CRITICAL', frozenset({'fatal', 'critical', 'emergency'})),
+    ('HIGH', frozenset({'error', 'exception', 'failed'})),
+    ('MEDIUM', frozenset({'warning', 'warn'})),
+)
+
+# Every keyword above in one multi-pattern scan. Each alternative is a zero-width
+# lookahead tried at every position, longest first; a hit also implies the
+# shorter keywords that are its prefixes, so the scan finds every keyword present.
+_LOG_KEYWORDS = _ERROR_LINE_KEYWORDS.union(
+    *(keywords for _, rule in _ERROR_TYPE_RULES for keywords in rule),
+    *(keywords for _, keywords in _SEVERITY_RULES),
+)
+_LOG_KEYWORDS_RE = re.compile(
+    "(?=(%s))" % "|".join(map(re.escape, sorted(_LOG_KEYWORDS, key=len, reverse=True)))
+)
+_IMPLIED_KEYWORDS = {
+    keyword: frozenset(prefix for prefix in _LOG_KEYWORDS if keyword.startswith(prefix))
+    for keyword in _LOG_KEYWORDS
+}
+
+@functools.lru_cache(maxsize=32)
+def _relevance_re(terms):
+    """Bytes pattern for anything that can make a log line an entry: the search terms or an error keyword"""
+    keywords = [term.lower().encode() for term in terms] + [keyword.encode() for keyword in sorted(_ERROR_LINE_KEYWORDS)]
+    return re.compile(b"|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+def _may_have_entries(file_path: str, task_id: str, query: str) -> bool:
+    """Cheap whole-file check over a memory map; False means no line can produce an entry"""
+    terms = (task_id, query) if query else (task_id,)
+    if not task_id or not all(term.isascii() for term in terms):
+        return True  # Every line matches, or the bytes pattern could not fold case like str.lower
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _relevance_re(terms).search(mm) is not None
+
+_SEVERITY_KEYWORDS = frozenset().union(*(keywords for _, keywords in _SEVERITY_RULES))
+
+@functools.lru_cache(maxsize=None)
+def _severity_for(severity_keywords: frozenset) -> str:
+    """Severity for a set of severity keywords; there are only 2**8 such sets, so
+    every distinct one is resolved once and then served from this table"""
+    for severity, keywords in _SEVERITY_RULES:
+        if not severity_keywords.isdisjoint(keywords):
+            return severity
+    return 'LOW'
+
+def _line_keywords(line_lower: str) -> frozenset:
+    """Every rule keyword found in a lowercased line, from a single scan"""
+    return frozenset().union(*(_IMPLIED_KEYWORDS[match.group(1)]
+                               for match in _LOG_KEYWORDS_RE.finditer(line_lower)))
+
+_TIMELINE_KEY = operator.attrgetter('timestamp')
+
+def _pool_worthwhile(paths: List[str]) -> bool:
+    """Whether a batch is big enough, in files and bytes, for a process pool to pay off"""
+    if len(paths) < PARALLEL_MIN_FILES:
+        return False
+    total_bytes = 0
+    for path in paths:
+        try:
+            total_bytes += os.path.getsize(path)
+        except OSError:
+            pass
+        if total_bytes >= PARALLEL_MIN_BYTES:
+            return True
+    return False
+
+def _pool_context():
+    """Workers start from a clean server process rather than a fork of this one,
+    which may have other threads (async CrewAI tasks) holding locks"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+@functools.lru_cache(maxsize=None)
+def _worker_tool():
+    # One tool per worker process; its parsing methods keep no per-call state
+    return LogAnalysisTool()
+
+def _parse_batch(args):
+    """Parse a batch of log files in a worker process"""
+    file_paths, task_id, query = args
+    tool = _worker_tool()
+    return [tool._parse_log_file(file_path, task_id, query) for file_path in file_paths]
+
 class LogAnalysisTool(BaseTool):
     """Tool for analyzing system logs and extracting error patterns"""
     
     name: str = "log_analysis_tool"
     description: str = "Analyzes system logs to identify errors, patterns, and create timelines for operational issues"
+    max_workers: Optional[int] = None  # Worker processes; None uses every CPU
+    batch_size: int = 64  # Most files handed to a worker at once
     
     def _run(self, task_id: str, query: str = "", log_directory: str = "data/logs") -> str:
         """
@@ -34,16 +173,16 @@ class LogAnalysisTool(BaseTool):
             # Search for task-related entries
             task_entries = []
             error_entries = []
-            timeline = []
+            file_timelines = []
             
-            for log_file in log_files:
-                entries = self._parse_log_file(log_file, task_id, query)
+            for entries in self._parse_log_files(log_files, task_id, query):
                 task_entries.extend(entries['task_related'])
                 error_entries.extend(entries['errors'])
-                timeline.extend(entries['timeline'])
+                file_timelines.append(entries['timeline'])
             
-            # Sort timeline chronologically
-            timeline.sort(key=lambda x: x['timestamp'])
+            # Each file's timeline comes back sorted, so merging them keeps it
+            # chronological; ties stay in file order, as a stable sort left them
+            timeline = list(heapq.merge(*file_timelines, key=_TIMELINE_KEY))
             
             # Analyze patterns
             error_patterns = self._analyze_error_patterns(error_entries)
@@ -60,18 +199,48 @@ class LogAnalysisTool(BaseTool):
         except Exception as e:
             return f"Error analyzing logs: {str(e)}"
     
+    def _parse_log_files(self, log_files: List[str], task_id: str, query: str):
+        """Yield each file's entries in file order, across worker processes for many files"""
+        if not _pool_worthwhile(log_files):
+            for log_file in log_files:
+                yield self._parse_log_file(log_file, task_id, query)
+            return
+        
+        # Smaller batches when there are few files, so every worker gets some
+        workers = self.max_workers or os.cpu_count() or 1
+        size = max(1, min(self.batch_size, -(-len(log_files) // workers)))
+        batches = [(log_files[i:i + size], task_id, query) for i in range(0, len(log_files), size)]
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_pool_context()) as executor:
+            for results in executor.map(_parse_batch, batches):
+                yield from results
+    
     def _find_log_files(self, directory: str) -> List[str]:
-        """Find all log files in the directory"""
-        patterns = ["*.log", "*.txt", "*.out"]
-        log_files = []
+        """Find log files in the directory and its direct subdirectories, in one pass"""
+        # Grouped as the old per-pattern globs returned them: by extension, then top level first
+        by_extension = {extension: ([], []) for extension in LOG_EXTENSIONS}
+        
+        def collect(path, depth):
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                return  # Unreadable directories are skipped, as glob did
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        if depth == 0:
+                            collect(entry.path, 1)
+                    else:
+                        groups = by_extension.get(os.path.splitext(entry.name)[1])
+                        if groups is not None:
+                            groups[depth].append(entry.path)
         
-        for pattern in patterns:
-            log_files.extend(glob.glob(os.path.join(directory, pattern)))
-            log_files.extend(glob.glob(os.path.join(directory, "*", pattern)))
+        collect(directory, 0)
         
-        return log_files
+        return [path for groups in by_extension.values() for files in groups for path in files]
     
-    def _parse_log_file(self, file_path: str, task_id: str, query: str) -> Dict[str, List]:
+    def _parse_log_file(self, file_path: str, task_id: str, query: str) -> Dict[str, List[LogEntry]]:
         """Parse a single log file for relevant entries"""
         entries = {
             'task_related': [],
@@ -79,128 +248,118 @@ class LogAnalysisTool(BaseTool):
             'timeline': []
         }
         
+        task_id_lower = task_id.lower()
+        query_lower = query.lower()
+        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Extract timestamp
-                timestamp = self._extract_timestamp(line)
-                
-                # Check for task ID
-                if task_id.lower() in line.lower():
-                    entry = {
-                        'file': file_path,
-                        'line_number': line_num,
-                        'content': line,
-                        'timestamp': timestamp
-                    }
-                    entries['task_related'].append(entry)
-                    entries['timeline'].append(entry)
-                
-                # Check for errors
-                if self._is_error_line(line):
-                    error_entry = {
-                        'file': file_path,
-                        'line_number': line_num,
-                        'content': line,
-                        'timestamp': timestamp,
-                        'error_type': self._classify_error(line),
-                        'severity': self._determine_severity(line)
-                    }
-                    entries['errors'].append(error_entry)
+            # Logs with nothing relevant are skipped after one C-level scan of
+            # the mapped file, without decoding a single line
+            if not _may_have_entries(file_path, task_id, query):
+                return entries
+            
+            # Bound once here rather than looked up on every line
+            add_task_entry = entries['task_related'].append
+            add_error = entries['errors'].append
+            add_timeline = entries['timeline'].append
+            extract_timestamp = self._extract_timestamp
+            is_error_line = self._is_error_line
+            classify_error = self._classify_error
+            determine_severity = self._determine_severity
+            
+            # Stream the file so memory stays flat however large the log is
+            with open(file_path, 'r', encoding='utf-8', errors='ignore',
+                      buffering=LOG_READ_BUFFER_BYTES) as f:
+                for line_num, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    line_lower = line.lower()
+                    is_task_line = task_id_lower in line_lower
+                    keywords = _line_keywords(line_lower)
+                    
+                    # Extract timestamp
+                    timestamp = extract_timestamp(line)
+                    
+                    # Check for task ID
+                    if is_task_line:
+                        entry = LogEntry(
+                            file=file_path,
+                            line_number=line_num,
+                            content=line,
+                            timestamp=timestamp
+                        )
+                        add_task_entry(entry)
+                        # A line goes on the timeline once, as its first match
+                        add_timeline(entry)
+                    
+                    # Check for errors
+                    if is_error_line(keywords):
+                        error_entry = LogEntry(
+                            file=file_path,
+                            line_number=line_num,
+                            content=line,
+                            timestamp=timestamp,
+                            error_type=classify_error(keywords),
+                            severity=determine_severity(keywords)
+                        )
+                        add_error(error_entry)
                     
-                    # Add to timeline if related to task
-                    if task_id.lower() in line.lower():
-                        entries['timeline'].append(error_entry)
-                
-                # Check for query terms
-                if query and query.lower() in line.lower():
-                    entry = {
-                        'file': file_path,
-                        'line_number': line_num,
-                        'content': line,
-                        'timestamp': timestamp,
-                        'match_type': 'query_match'
-                    }
-                    entries['timeline'].append(entry)
+                    # Check for query terms
+                    if query and not is_task_line and query_lower in line_lower:
+                        entry = LogEntry(
+                            file=file_path,
+                            line_number=line_num,
+                            content=line,
+                            timestamp=timestamp,
+                            match_type='query_match'
+                        )
+                        add_timeline(entry)
         
         except Exception as e:
             print(f"Error parsing file {file_path}: {e}")
         
+        # Lines are mostly in time order already, so this is close to a single pass
+        entries['timeline'].sort(key=_TIMELINE_KEY)
         return entries
     
     def _extract_timestamp(self, line: str) -> Optional[str]:
         """Extract timestamp from log line"""
-        # Common timestamp patterns
-        patterns = [
-            r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}',  # 2024-01-15 14:30:45
-            r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}',  # 01/15/2024 14:30:45
-            r'\w{3} \d{2} \d{2}:\d{2}:\d{2}',        # Jan 15 14:30:45
-        ]
+        match = _TIMESTAMP_RE.search(line)
+        if match is None:
+            return None
         
-        for pattern in patterns:
-            match = re.search(pattern, line)
-            if match:
-                return match.group(0)
+        # An earlier format wins even when it appears later in the line; it
+        # cannot start before the leftmost match, so only the rest is searched
+        for pattern in _TIMESTAMP_PATTERNS[:match.lastindex - 1]:
+            preferred = pattern.search(line, match.start())
+            if preferred:
+                return preferred.group(0)
         
-        return None
+        return match.group(0)
     
-    def _is_error_line(self, line: str) -> bool:
-        """Check if line contains error indicators"""
-        error_keywords = [
-            'error', 'exception', 'failed', 'failure', 'timeout',
-            'null pointer', 'connection refused', 'out of memory',
-            'stack trace', 'fatal', 'critical', 'alert'
-        ]
-        
-        line_lower = line.lower()
-        return any(keyword in line_lower for keyword in error_keywords)
+    def _is_error_line(self, keywords: frozenset) -> bool:
+        """Check if a line's keywords (from _line_keywords) include error indicators"""
+        return not keywords.isdisjoint(_ERROR_LINE_KEYWORDS)
     
-    def _classify_error(self, line: str) -> str:
-        """Classify the type of error"""
-        line_lower = line.lower()
-        
-        if 'null pointer' in line_lower or 'nullpointerexception' in line_lower:
-            return 'NullPointerException'
-        elif 'timeout' in line_lower:
-            return 'TimeoutError'
-        elif 'connection' in line_lower and ('refused' in line_lower or 'failed' in line_lower):
-            return 'ConnectionError'
-        elif 'memory' in line_lower:
-            return 'MemoryError'
-        elif 'security' in line_lower or 'unauthorized' in line_lower:
-            return 'SecurityError'
-        elif 'database' in line_lower or 'sql' in line_lower:
-            return 'DatabaseError'
-        else:
-            return 'GeneralError'
+    def _classify_error(self, keywords: frozenset) -> str:
+        """Classify the type of error from a line's keywords"""
+        for error_type, rule in _ERROR_TYPE_RULES:
+            if all(not keywords.isdisjoint(alternatives) for alternatives in rule):
+                return error_type
+        return 'GeneralError'
     
-    def _determine_severity(self, line: str) -> str:
-        """Determine error severity"""
-        line_lower = line.lower()
-        
-        if any(word in line_lower for word in ['fatal', 'critical', 'emergency']):
-            return 'CRITICAL'
-        elif any(word in line_lower for word in ['error', 'exception', 'failed']):
-            return 'HIGH'
-        elif any(word in line_lower for word in ['warning', 'warn']):
-            return 'MEDIUM'
-        else:
-            return 'LOW'
+    def _determine_severity(self, keywords: frozenset) -> str:
+        """Determine error severity from a line's keywords"""
+        return _severity_for(keywords & _SEVERITY_KEYWORDS)
     
-    def _analyze_error_patterns(self, error_entries: List[Dict]) -> Dict[str, Any]:
+    def _analyze_error_patterns(self, error_entries: List[LogEntry]) -> Dict[str, Any]:
         """Analyze patterns in error entries"""
         patterns = {}
         
         # Group by error type
         error_types = {}
         for entry in error_entries:
-            error_type = entry.get('error_type', 'Unknown')
+            error_type = entry.error_type or 'Unknown'
             if error_type not in error_types:
                 error_types[error_type] = []
             error_types[error_type].append(entry)
@@ -221,21 +380,21 @@ class LogAnalysisTool(BaseTool):
         
         return patterns
     
-    def _analyze_severity(self, error_entries: List[Dict]) -> Dict[str, int]:
+    def _analyze_severity(self, error_entries: List[LogEntry]) -> Dict[str, int]:
         """Analyze severity distribution"""
         severity_counts = {}
         for entry in error_entries:
-            severity = entry.get('severity', 'UNKNOWN')
+            severity = entry.severity or 'UNKNOWN'
             severity_counts[severity] = severity_counts.get(severity, 0) + 1
         
         return severity_counts
     
-    def _generate_log_report(self, task_id: str, task_entries: List[Dict], 
-                           error_entries: List[Dict], timeline: List[Dict],
+    def _generate_log_report(self, task_id: str, task_entries: List[LogEntry], 
+                           error_entries: List[LogEntry], timeline: List[LogEntry],
                            error_patterns: Dict, severity_analysis: Dict) -> str:
         """Generate comprehensive log analysis report"""
         
-        report = f"""
+        parts = [f"""
 ========================================
 LOG ANALYSIS REPORT - {task_id}
 ========================================
@@ -247,40 +406,40 @@ EXECUTIVE SUMMARY:
 - Analysis timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 SEVERITY BREAKDOWN:
-"""
+"""]
         
         for severity, count in severity_analysis.items():
-            report += f"- {severity}: {count} occurrences\n"
+            parts.append(f"- {severity}: {count} occurrences\n")
         
-        report += f"""
+        parts.append(f"""
 ERROR PATTERN ANALYSIS:
 Top Error Types:
-"""
+""")
         
         for error_type, count in error_patterns['most_frequent']:
-            report += f"- {error_type}: {count} occurrences\n"
+            parts.append(f"- {error_type}: {count} occurrences\n")
         
         if timeline:
-            report += f"""
+            parts.append(f"""
 CRITICAL TIMELINE EVENTS:
-"""
+""")
             # Show first 10 timeline events
             for i, event in enumerate(timeline[:10]):
-                timestamp = event.get('timestamp', 'Unknown time')
-                content = event['content'][:100] + '...' if len(event['content']) > 100 else event['content']
-                report += f"{i+1}. [{timestamp}] {content}\n"
+                timestamp = event.timestamp
+                content = event.content[:100] + '...' if len(event.content) > 100 else event.content
+                parts.append(f"{i+1}. [{timestamp}] {content}\n")
         
         if error_entries:
-            report += f"""
+            parts.append(f"""
 RECENT CRITICAL ERRORS:
-"""
+""")
             # Show most recent critical errors
-            critical_errors = [e for e in error_entries if e.get('severity') == 'CRITICAL'][:5]
+            critical_errors = [e for e in error_entries if e.severity == 'CRITICAL'][:5]
             for i, error in enumerate(critical_errors):
-                report += f"{i+1}. {error['error_type']}: {error['content'][:100]}...\n"
-                report += f"   File: {error['file']}, Line: {error['line_number']}\n"
+                parts.append(f"{i+1}. {error.error_type}: {error.content[:100]}...\n")
+                parts.append(f"   File: {error.file}, Line: {error.line_number}\n")
         
-        report += f"""
+        parts.append(f"""
 RECOMMENDATIONS:
 - Focus on {error_patterns['most_frequent'][0][0] if error_patterns['most_frequent'] else 'general'} error resolution
 - Review timeline around critical error occurrences
@@ -288,6 +447,6 @@ RECOMMENDATIONS:
 - Consider code review for areas with high error frequency
 
 ========================================
-"""
+""")
         
-        return report
+        return "".join(parts)
@@ -1,14 +1,12 @@
 
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-# Sample data creation functions
-def create_sample_logs():
-    """Create sample log files for testing"""
-    log_dir = "data/logs"
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # Application log
-    app_log_content = f"""2024-01-15 14:30:45 INFO  [main] Application started successfully
+# Fixture contents, encoded once at import rather than rebuilt on every call
+# Application log
+_APP_LOG = b"""2024-01-15 14:30:45 INFO  [main] Application started successfully
 2024-01-15 14:31:12 DEBUG [worker-1] Processing task TID-12345
 2024-01-15 14:31:15 ERROR [worker-1] NullPointerException in TaskProcessor.process() for TID-12345
 2024-01-15 14:31:15 ERROR [worker-1] java.lang.NullPointerException: Cannot invoke method on null object
@@ -20,44 +18,110 @@ def create_sample_logs():
 2024-01-15 14:33:01 FATAL [system] OutOfMemoryError detected for TID-12348
 2024-01-15 14:33:02 ERROR [security] Unauthorized access attempt blocked
 2024-01-15 14:34:00 INFO  [main] System health check completed"""
-    
-    with open(f"{log_dir}/application.log", "w") as f:
-        f.write(app_log_content)
-    
-    # Error log
-    error_log_content = f"""2024-01-15 14:31:15 [ERROR] TID-12345 NullPointerException in com.example.TaskProcessor.process(TaskProcessor.java:142)
+
+# Error log
+_ERROR_LOG = b"""2024-01-15 14:31:15 [ERROR] TID-12345 NullPointerException in com.example.TaskProcessor.process(TaskProcessor.java:142)
 2024-01-15 14:31:45 [ERROR] TID-12345 Task execution failed: Maximum retry attempts exceeded
 2024-01-15 14:33:00 [ERROR] TID-12347 Database connection timeout after 30 seconds
 2024-01-15 14:33:01 [FATAL] TID-12348 java.lang.OutOfMemoryError: Java heap space
 2024-01-15 14:35:00 [ERROR] TID-12349 Connection refused to external service"""
-    
-    with open(f"{log_dir}/error.log", "w") as f:
-        f.write(error_log_content)
 
-def create_performance_logs():
-    """Create performance-specific log files"""
-    log_dir = "data/logs"
-    os.makedirs(log_dir, exist_ok=True)
-    
-    perf_log_content = f"""2024-01-15 14:30:00 [PERF] TID-12346 Task execution started
+# Performance log
+_PERF_LOG = b"""2024-01-15 14:30:00 [PERF] TID-12346 Task execution started
 2024-01-15 14:30:05 [PERF] TID-12346 Database query took 5200ms (threshold: 1000ms)
 2024-01-15 14:30:10 [PERF] TID-12346 Memory usage: 85% of heap (warning threshold)
 2024-01-15 14:30:15 [PERF] TID-12346 CPU usage spike: 95% for 10 seconds
 2024-01-15 14:30:30 [PERF] TID-12346 Task completed in 30.2 seconds (SLA: 15 seconds)"""
-    
-    with open(f"{log_dir}/performance.log", "w") as f:
-        f.write(perf_log_content)
 
-def create_security_logs():
-    """Create security-specific log files"""
-    log_dir = "data/logs"
-    os.makedirs(log_dir, exist_ok=True)
-    
-    security_log_content = f"""2024-01-15 14:32:00 [SECURITY] Authentication failure for user admin
+# Security log
+_SECURITY_LOG = b"""2024-01-15 14:32:00 [SECURITY] Authentication failure for user admin
 2024-01-15 14:32:05 [SECURITY] Multiple failed login attempts from IP 192.168.1.100
 2024-01-15 14:32:10 [SECURITY] TID-12350 Potential SQL injection attempt blocked
 2024-01-15 14:32:15 [SECURITY] Unauthorized API access attempt for TID-12350
 2024-01-15 14:32:20 [SECURITY] Rate limiting activated for suspicious activity"""
+
+# Fixture locations, built once rather than formatted on every call. SAMPLE_LOG_DIR
+# can point them at a tmpfs such as /dev/shm for throwaway runs.
+_LOG_DIR = Path(os.environ.get("SAMPLE_LOG_DIR", "data/logs"))
+_PATHS = {
+    "app": _LOG_DIR / "application.log",
+    "err": _LOG_DIR / "error.log",
+    "perf": _LOG_DIR / "performance.log",
+    "sec": _LOG_DIR / "security.log",
+}
+
+_LOG_DIR_READY = False
+
+def _ensure_log_dir():
+    """Create the log directory on first use; later calls skip the filesystem entirely"""
+    global _LOG_DIR_READY
+    if not _LOG_DIR_READY:
+        os.makedirs(_LOG_DIR, exist_ok=True)
+        _LOG_DIR_READY = True
+
+def _write_log(path, blob):
+    """Write a fixture straight to a raw descriptor: one open, one write, one close"""
+    # Reruns find the fixture already in place; a size mismatch settles most
+    # changes with one stat, and the files are small enough to compare whole
+    try:
+        if os.stat(path).st_size == len(blob):
+            with open(path, "rb") as f:
+                if f.read() == blob:
+                    return
+    except OSError:
+        pass
+    
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, [blob])
+        else:  # Windows has no writev
+            os.write(fd, blob)
+    finally:
+        os.close(fd)
+
+# Blob written to each fixture path
+_SPEC = {"app": _APP_LOG, "err": _ERROR_LOG, "perf": _PERF_LOG, "sec": _SECURITY_LOG}
+
+def _create_logs(keys):
+    """Write the fixtures named by their _PATHS keys, concurrently when there are several"""
+    _ensure_log_dir()
+    keys = tuple(keys)
+    if len(keys) == 1:
+        _write_log(_PATHS[keys[0]], _SPEC[keys[0]])
+        return
     
-    with open(f"{log_dir}/security.log", "w") as f:
-        f.write(security_log_content)
+    # The writes release the GIL, so the files' syscalls overlap; re-raises the first error
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        futures = [executor.submit(_write_log, _PATHS[key], _SPEC[key]) for key in keys]
+        for future in futures:
+            future.result()
+
+@functools.lru_cache(maxsize=None)
+def _create_logs_once(keys):
+    """_create_logs for a tuple of keys, run at most once per process; a caller that
+    only needs the fixtures to exist can repeat it for free (.cache_clear() resets it)"""
+    _create_logs(keys)
+
+# Sample data creation functions. Each call rewrites any fixture that is missing
+# or changed; fixtures already in place cost a stat and a read.
+def create_sample_logs():
+    """Create sample log files for testing"""
+    _create_logs(("app", "err"))
+
+def create_performance_logs():
+    """Create performance-specific log files"""
+    _create_logs(("perf",))
+
+def create_security_logs():
+    """Create security-specific log files"""
+    _create_logs(("sec",))
+
+def create_all_logs():
+    """Create every sample log file in one pass"""
+    _create_logs(_SPEC)
+
+def create_sample_logs_in_memory():
+    """Sample log contents by file name, for callers that only read them; touches no files"""
+    return {path.name: _SPEC[key] for key, path in _PATHS.items()}